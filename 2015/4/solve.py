@@ -2,9 +2,17 @@
 from sys import argv
 from datetime import datetime
 
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import md5
 
 
+# Nonces checked by a single task of the process pool
+CHUNK_SIZE = 100_000
+
+
 def get_input(filename: str):
     with open(filename, "r") as f:
         _in = f.read().replace("\n", "").strip()
@@ -12,18 +20,80 @@ def get_input(filename: str):
     return _in
 
 
+def search_chunk(key: str, zeros: int, start: int, stop: int) -> int | None:
+    """
+    Finds the smallest nonce in [start, stop) whose MD5 of key + nonce starts with
+    the given number of zero hex digits.
+
+    The hash state of the key is computed once and copied for every nonce, and the
+    zeros are checked on the raw digest (two hex digits per byte) instead of hexdigest().
+    """
+    prefix = md5(key.encode())
+    zero_bytes = bytes(zeros // 2)
+    full = zeros // 2
+    odd = zeros % 2
+
+    for i in range(start, stop):
+        h = prefix.copy()
+        h.update(b"%d" % i)
+        digest = h.digest()
+        if digest[:full] == zero_bytes and (not odd or digest[full] < 16):
+            return i
+    return None
+
+
+def use_pool(processes: int) -> bool:
+    """
+    Whether the search should use a process pool.
+
+    Only forked workers are used: loaded by the runner the module is not importable by
+    name, so spawned (or forkserver) workers could not unpickle `search_chunk`. A process
+    which is itself a pool worker (e.g. of `aoc.bench -j`) does not start another pool.
+    """
+    if processes == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return False
+    return multiprocessing.parent_process() is None
+
+
+def find_nonce(key: str, zeros: int, start: int = 0, processes: int | None = None) -> int:
+    """
+    Finds the smallest nonce for which MD5 of key + nonce starts with `zeros` zero hex digits.
+
+    The nonces are split into chunks, searched by a process pool a few chunks ahead, and
+    the results are consumed in chunk order: a hit in a chunk is only returned once all of
+    the lower chunks came back empty, so the smallest nonce wins even if a later chunk
+    finishes first.
+    """
+    processes = processes or os.cpu_count() or 1
+    if not use_pool(processes):
+        # A pool only adds overhead on a single core
+        chunk_start = start
+        while (nonce := search_chunk(key, zeros, chunk_start, chunk_start + CHUNK_SIZE)) is None:
+            chunk_start += CHUNK_SIZE
+        return nonce
+
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("fork")) as executor:
+        pending = deque()
+        next_start = start
+        while True:
+            # Keep every worker busy with a chunk queued behind it
+            while len(pending) < 2 * processes:
+                pending.append(executor.submit(search_chunk, key, zeros, next_start, next_start + CHUNK_SIZE))
+                next_start += CHUNK_SIZE
+
+            nonce = pending.popleft().result()
+            if nonce is not None:
+                for future in pending:
+                    future.cancel()
+                return nonce
+
+
 def part1(_in):
-    i = 0
-    while md5((_in + str(i)).encode()).hexdigest()[:5] != "00000":
-        i += 1
-    return i
+    return find_nonce(_in, 5)
 
 
 def part2(_in):
-    i = 0
-    while md5((_in + str(i)).encode()).hexdigest()[:6] != "000000":
-        i += 1
-    return i
+    return find_nonce(_in, 6)
 
 
 def benchmark(name: str, func, *_in) -> None:
@@ -2,40 +2,131 @@
 from sys import argv
 from datetime import datetime
 
+from itertools import islice
+
+import numpy as np
+
 
 VOWELS = "aeiou"
 FORBIDDEN_STRINGS = ["ab", "cd", "pq", "xy"]
 
+VOWEL_CODES = np.frombuffer(VOWELS.encode(), dtype=np.uint8)
+# Pairs of letters as (first << 8) | second
+FORBIDDEN_CODES = np.array([ord(a) << 8 | ord(b) for a, b in FORBIDDEN_STRINGS], dtype=np.uint16)
+
+# Words read from the stream per batch
+BATCH_SIZE = 1 << 16
+
+
+def classify(word: str) -> tuple[bool, bool]:
+    """
+    Evaluates the rules of both parts in a single scan of the word.
+
+    Returns:
+        tuple[bool, bool]: Whether the word is nice (part 1) and nicer (part 2).
+    """
+    vowels = 0
+    double = False
+    forbidden = False
+    repeated_pair = False
+    sandwich = False
+    # The first index of every pair, a pair repeats without overlapping 2+ positions later
+    pair_indices = {}
+
+    before = previous = ""
+    for i, char in enumerate(word):
+        if char in VOWELS:
+            vowels += 1
+        pair = previous + char
+        if previous:
+            if char == previous:
+                double = True
+            if pair in FORBIDDEN_STRINGS:
+                forbidden = True
+            first = pair_indices.setdefault(pair, i)
+            if i - first >= 2:
+                repeated_pair = True
+        if char == before:
+            sandwich = True
+        before, previous = previous, char
+
+    return vowels >= 3 and double and not forbidden, repeated_pair and sandwich
 
-def is_nice(word: str) -> bool:
-    # Count the vowels
-    if sum(word.count(vowel) for vowel in VOWELS) < 3:
-        return False
 
-    # Check whether there is a letter twice in a row
-    if all(char1 != char2 for char1, char2 in zip(word, word[1:])):
-        return False
-
-    # Check whether it has a forbidden fragment
-    if any(word.find(forbidden) != -1 for forbidden in FORBIDDEN_STRINGS):
-        return False
-    
-    return True
+def is_nice(word: str) -> bool:
+    return classify(word)[0]
 
 
 def is_nicer(word: str) -> bool:
-
-    if all(word.count(char1+char2) < 2 for char1, char2 in zip(word, word[1:])):
-        return False
-
-    if all(
-        char1 != char3 
-        for char1, char2, char3
-        in zip(word, word[1:], word[2:])
-    ):
-        return False
-
-    return True
+    return classify(word)[1]
+
+
+def classify_matrix(words: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates the rules for a whole batch of words of the same length at once.
+
+    Parameters:
+        words (np.ndarray): The (words, length) `np.uint8` matrix of the letters.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The boolean nice and nicer masks.
+    """
+    pairs = words[:, :-1].astype(np.uint16) << 8 | words[:, 1:]
+
+    vowels = np.isin(words, VOWEL_CODES).sum(axis=1) >= 3
+    double = (words[:, 1:] == words[:, :-1]).any(axis=1)
+    forbidden = np.isin(pairs, FORBIDDEN_CODES).any(axis=1)
+    nice = vowels & double & ~forbidden
+
+    # A pair repeating at any distance of 2 or more, i.e. without overlapping
+    repeated_pair = np.zeros(len(words), dtype=bool)
+    for distance in range(2, pairs.shape[1]):
+        repeated_pair |= (pairs[:, distance:] == pairs[:, :-distance]).any(axis=1)
+    sandwich = (words[:, 2:] == words[:, :-2]).any(axis=1)
+    nicer = repeated_pair & sandwich
+
+    return nice, nicer
+
+
+def count_words(words: list[bytes]) -> tuple[int, int]:
+    """
+    Counts the nice and nicer words, classifying the words of every length as one matrix.
+    """
+    by_length = {}
+    for word in words:
+        by_length.setdefault(len(word), []).append(word)
+
+    nice_count = nicer_count = 0
+    for length, group in by_length.items():
+        if length < 3:
+            # Too short for the matrix rules (and for being nice or nicer at all)
+            continue
+        matrix = np.frombuffer(b"".join(group), dtype=np.uint8).reshape(len(group), length)
+        nice, nicer = classify_matrix(matrix)
+        nice_count += int(nice.sum())
+        nicer_count += int(nicer.sum())
+    return nice_count, nicer_count
+
+
+def count_nice_stream(filename: str, batch_size: int = BATCH_SIZE) -> tuple[int, int]:
+    """
+    Counts the nice and nicer words of a file of any size, one batch of lines at a time,
+    so the memory stays bounded by the batch.
+
+    Returns:
+        tuple[int, int]: The number of nice and nicer words.
+    """
+    nice_count = nicer_count = 0
+    with open(filename, "rb") as f:
+        while True:
+            lines = list(islice(f, batch_size))
+            if not lines:
+                break
+            words = [line.strip() for line in lines]
+            nice, nicer = count_words([word for word in words if word])
+            nice_count += nice
+            nicer_count += nicer
+    return nice_count, nicer_count
 
 
 def get_input(filename: str):
@@ -45,14 +136,17 @@ def get_input(filename: str):
     return _in
 
 
+def prepare(_in):
+    # Both parts come from the same classification
+    return count_words([word.encode() for word in _in])
+
+
 def part1(_in):
-    nice_words = [word for word in _in if is_nice(word)]
-    return len(nice_words)
+    return _in[0]
 
 
 def part2(_in):
-    nicer_words = [word for word in _in if is_nicer(word)]
-    return len(nicer_words)
+    return _in[1]
 
 
 def benchmark(name: str, func, *_in) -> None:
@@ -66,7 +160,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
@@ -2,13 +2,15 @@
 from sys import argv
 from datetime import datetime
 
-from enum import Enum
 from abc import ABC, abstractmethod
 
 import numpy as np
 
 
 
+SIZE = 1000
+
+
 class Instruction(ABC):
     def __init__(self, _str: str):
         part1, part2 = _str.split(" through ")
@@ -19,49 +21,51 @@ class Instruction(ABC):
     def get_slice(self) -> slice:
         return (slice(self._from[0], self._to[0]+1), slice(self._from[1], self._to[1]+1))
 
+    def get_compressed_slice(self, xs: np.ndarray, ys: np.ndarray) -> slice:
+        """
+        The slice of the compressed cells covered by the rectangle, where the compressed
+        cell (i, j) spans [xs[i], xs[i+1]) x [ys[j], ys[j+1]).
+        """
+        x_from, x_to = np.searchsorted(xs, (self._from[0], self._to[0]+1))
+        y_from, y_to = np.searchsorted(ys, (self._from[1], self._to[1]+1))
+        return (slice(x_from, x_to), slice(y_from, y_to))
+
     @abstractmethod
-    def perform(self, table: np.ndarray) -> None:
-        pass
+    def switch(self, cells: np.ndarray) -> None:
+        """
+        PART 1: Switches the lights of the boolean cells (a view of the table) in place.
+        """
+
+    @abstractmethod
+    def adjust(self, cells: np.ndarray) -> None:
+        """
+        PART 2: Changes the brightness of the unsigned integer cells in place.
+        """
 
 
 class OnInstruction(Instruction):
-    def perform(self, table: np.ndarray) -> None:
-        # PART 1
-        # table[self.get_slice()].fill(1)
+    def switch(self, cells: np.ndarray) -> None:
+        cells[...] = True
 
-        # PART 2
-        diff = np.zeros(np.shape(table[self.get_slice()]))
-        diff.fill(1)
-        table[self.get_slice()] += diff
+    def adjust(self, cells: np.ndarray) -> None:
+        cells += 1
 
 
 class OffInstruction(Instruction):
-    def perform(self, table: np.ndarray) -> None:
-        # PART 1
-        # table[self.get_slice()].fill(0)
-
-        # PART 2
-
-        table_slice = table[self.get_slice()]
+    def switch(self, cells: np.ndarray) -> None:
+        cells[...] = False
 
-        for y in range(len(table_slice)):
-            for x in range(len(table_slice[y])):
-                if table_slice[y][x] > 0:
-                    table_slice[y][x] -= 1
+    def adjust(self, cells: np.ndarray) -> None:
+        # The brightness never goes below zero (nor wraps around the unsigned dtype)
+        np.subtract(cells, 1, out=cells, where=cells > 0)
 
-        table[self.get_slice()] = table_slice
 
 class ToggleInstruction(Instruction):
+    def switch(self, cells: np.ndarray) -> None:
+        cells ^= True
 
-    def perform(self, table: np.ndarray) -> None:
-        # PART 1
-        # table[self.get_slice()] = np.logical_not(table[self.get_slice()])
-
-        # PART 2
-        diff = np.zeros(np.shape(table[self.get_slice()]))
-        diff.fill(2)
-        table[self.get_slice()] += diff
-
+    def adjust(self, cells: np.ndarray) -> None:
+        cells += 2
 
 
 TYPE_TO_CLASS = {
@@ -83,20 +87,90 @@ def get_input(filename: str):
     return _in
 
 
-def part1(_in):
-
-    table = np.zeros((1000, 1000))
+def brightness_dtype(instructions: list[Instruction]) -> type:
+    # Every instruction adds at most 2, so the smallest dtype that cannot overflow
+    return np.uint16 if 2 * len(instructions) <= np.iinfo(np.uint16).max else np.uint32
+
+
+def run(instructions: list[Instruction], brightness: bool = False, size: int = SIZE) -> int:
+    """
+    Applies the instructions to a size x size grid of lights, each one as a single
+    in-place operation on a slice of the table.
+
+    Parameters:
+        instructions (list[Instruction]): The parsed instructions.
+        brightness (bool): Use the part 2 semantics (brightness) instead of on/off.
+        size (int): The width and height of the grid.
+
+    Returns:
+        int: The number of lit lights, or the total brightness.
+    """
+    if not brightness:
+        table = np.zeros((size, size), dtype=bool)
+        for instruction in instructions:
+            instruction.switch(table[instruction.get_slice()])
+        return int(np.count_nonzero(table))
+
+    table = np.zeros((size, size), dtype=brightness_dtype(instructions))
+    for instruction in instructions:
+        instruction.adjust(table[instruction.get_slice()])
+    return int(table.sum(dtype=np.int64))
+
+
+def compress(instructions: list[Instruction]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Collects the x and y breakpoints: the first and one past the last coordinate of
+    every rectangle. Between two neighbouring breakpoints all lights are always in the
+    same state, so each cell of the compressed grid stands for a whole block of lights.
+    """
+    xs = np.unique([c for i in instructions for c in (i._from[0], i._to[0]+1)])
+    ys = np.unique([c for i in instructions for c in (i._from[1], i._to[1]+1)])
+    return xs, ys
+
+
+def run_compressed(instructions: list[Instruction], brightness: bool = False) -> int:
+    """
+    Same as `run`, but on the coordinate-compressed grid of at most (2n)^2 cells for
+    n instructions, each weighted by the number of lights it stands for. The grid size
+    (e.g. coordinates in the millions) no longer bounds the memory or the time.
+
+    Parameters:
+        instructions (list[Instruction]): The parsed instructions.
+        brightness (bool): Use the part 2 semantics (brightness) instead of on/off.
+
+    Returns:
+        int: The number of lit lights, or the total brightness.
+    """
+    if not instructions:
+        return 0
+
+    xs, ys = compress(instructions)
+    # Python integers once the total could overflow int64 (e.g. 10^10 x 10^10 grids)
+    total_area = int(xs[-1] - xs[0]) * int(ys[-1] - ys[0])
+    weight_dtype = np.int64 if total_area * 2 * len(instructions) < 2**63 else object
+    # The number of lights of every compressed cell
+    areas = np.outer(np.diff(xs).astype(weight_dtype), np.diff(ys).astype(weight_dtype))
+    shape = areas.shape
+
+    if not brightness:
+        table = np.zeros(shape, dtype=bool)
+        for instruction in instructions:
+            instruction.switch(table[instruction.get_compressed_slice(xs, ys)])
+        return int(areas[table].sum())
+
+    table = np.zeros(shape, dtype=brightness_dtype(instructions))
+    for instruction in instructions:
+        instruction.adjust(table[instruction.get_compressed_slice(xs, ys)])
+    return int((table * areas).sum())
 
-    for instruction in _in:
-        instruction.perform(table)
 
-    print(table[500:, 500:])
+def part1(_in):
+    return run(_in)
 
-    return int(np.sum(table))
 
 def part2(_in):
-    # FOR PART 1 CHANGE THE COMMENT IN INSTRUCTION CLASSES
-    pass
+    return run(_in, brightness=True)
+
 
 def benchmark(name: str, func, *_in) -> None:
     now = datetime.now()
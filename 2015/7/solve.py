@@ -2,41 +2,150 @@
 from sys import argv
 from datetime import datetime
 
-from functools import lru_cache
-
-
-class Register:
-    def __init__(self, registers: dict, instruction_str: str):
-        self.registers = registers
-        self.instruction_str = instruction_str
-
-    def get_value(self) -> int:
-
-        instruction_str = self.instruction_str
-
-        part1, part2 = self.instruction_str.split(" -> ")
-        part1 = part1.split()
-
-        if "AND" in instruction_str:
-            return self.get_register_value(part1[0]) & self.get_register_value(part1[-1])
-        elif "OR" in instruction_str:
-            return self.get_register_value(part1[0]) | self.get_register_value(part1[-1])
-        elif "NOT" in instruction_str:
-            return self.get_register_value(part1[-1]) ^ 0xFFFF
-        elif "LSHIFT" in instruction_str:
-            return (self.get_register_value(part1[0]) << self.get_register_value(part1[-1])) & 0xFFFF
-        elif "RSHIFT" in instruction_str:
-            return (self.get_register_value(part1[0]) >> self.get_register_value(part1[-1])) & 0xFFFF
-        else:
-            # Register definition
-            return self.get_register_value(part1[0])
-
-    @lru_cache
-    def get_register_value(self, register_name: str) -> int:
-        try:
-            return int(register_name)
-        except ValueError:
-            return self.registers[register_name].get_value()
+from collections import deque
+
+
+MASK = 0xFFFF
+
+# Opcodes of the compiled gates
+ASSIGN, NOT, AND, OR, LSHIFT, RSHIFT = range(6)
+
+OPCODES = {
+    "AND": AND,
+    "OR": OR,
+    "LSHIFT": LSHIFT,
+    "RSHIFT": RSHIFT,
+}
+
+
+class Circuit:
+    """
+    The wire list compiled once into a topologically sorted program of
+    (opcode, output, operand a, operand b) slot indices.
+
+    Every wire has a slot in the values list, and so has every distinct constant
+    (pre-filled), so the gates never check whether an operand is a number.
+    Evaluating is a single loop over the program, without recursion or parsing.
+    """
+
+    def __init__(self, instructions: list[str]):
+        self.slots: dict[str, int] = dict()
+        self.initial: list[int] = []
+        gates = dict()
+
+        for instruction_str in instructions:
+            expression, wire = instruction_str.split(" -> ")
+            tokens = expression.split()
+
+            if len(tokens) == 1:
+                gate = (ASSIGN, tokens[0], tokens[0])
+            elif tokens[0] == "NOT":
+                gate = (NOT, tokens[1], tokens[1])
+            else:
+                gate = (OPCODES[tokens[1]], tokens[0], tokens[2])
+            gates[wire] = gate
+
+        for _, a, b in gates.values():
+            for operand in (a, b):
+                if not operand.isdigit() and operand not in gates:
+                    raise ValueError(f'The wire "{operand}" has no input')
+
+        for wire in gates:
+            self.get_slot(wire)
+
+        # The gates by output slot, with the operands resolved to slots
+        compiled = {
+            self.slots[wire]: (opcode, self.slots[wire], self.get_slot(a), self.get_slot(b))
+            for wire, (opcode, a, b) in gates.items()
+        }
+
+        # Kahn's algorithm: a gate is ready once all of its input wires are computed
+        self.dependents: dict[int, list[int]] = {slot: [] for slot in range(len(self.initial))}
+        missing = dict()
+        for slot, (_, _, a, b) in compiled.items():
+            inputs = {operand for operand in (a, b) if operand in compiled}
+            missing[slot] = len(inputs)
+            for operand in inputs:
+                self.dependents[operand].append(slot)
+
+        queue = deque(slot for slot, count in missing.items() if count == 0)
+        self.program: list[tuple[int, int, int, int]] = []
+        while queue:
+            slot = queue.popleft()
+            self.program.append(compiled[slot])
+            for dependent in self.dependents[slot]:
+                missing[dependent] -= 1
+                if missing[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(self.program) != len(compiled):
+            raise ValueError("The circuit has a cycle")
+
+        # The position of every gate in the program, to re-run cones in order
+        self.order = {gate[1]: i for i, gate in enumerate(self.program)}
+
+    def get_slot(self, operand: str) -> int:
+        slot = self.slots.get(operand)
+        if slot is None:
+            slot = len(self.initial)
+            self.slots[operand] = slot
+            # Constants keep their value, wires are computed
+            self.initial.append(int(operand) & MASK if operand.isdigit() else 0)
+        return slot
+
+    @staticmethod
+    def execute(program: list[tuple[int, int, int, int]], values: list[int]) -> None:
+        for opcode, out, a, b in program:
+            if opcode == ASSIGN:
+                values[out] = values[a]
+            elif opcode == AND:
+                values[out] = values[a] & values[b]
+            elif opcode == OR:
+                values[out] = values[a] | values[b]
+            elif opcode == NOT:
+                values[out] = values[a] ^ MASK
+            elif opcode == LSHIFT:
+                values[out] = (values[a] << values[b]) & MASK
+            else:
+                values[out] = values[a] >> values[b]
+
+    def evaluate(self) -> list[int]:
+        """
+        Computes all wires.
+
+        Returns:
+            list[int]: The values of all slots, see `get`.
+        """
+        values = list(self.initial)
+        self.execute(self.program, values)
+        return values
+
+    def get(self, values: list[int], wire: str) -> int:
+        return values[self.slots[wire]]
+
+    def override(self, values: list[int], wire: str, value: int) -> list[int]:
+        """
+        Forces the wire to the value (ignoring its gate) and re-evaluates only the gates
+        depending on it, directly or indirectly. The given values are not modified.
+
+        Returns:
+            list[int]: The values of all slots with the override applied.
+        """
+        slot = self.slots[wire]
+        values = list(values)
+        values[slot] = value & MASK
+
+        # The downstream cone of the wire
+        cone = set()
+        stack = list(self.dependents[slot])
+        while stack:
+            dependent = stack.pop()
+            if dependent not in cone:
+                cone.add(dependent)
+                stack.extend(self.dependents[dependent])
+
+        self.execute([self.program[i] for i in sorted(map(self.order.get, cone))], values)
+        return values
 
 
 def get_input(filename: str):
@@ -46,33 +155,19 @@ def get_input(filename: str):
     return _in
 
 
-def part1(_in):
+def prepare(_in):
+    # Both parts evaluate the same circuit
+    return Circuit(_in)
 
-    registers = dict()
-    for instruction_str in _in:
-        registers[instruction_str.split(" -> ")[-1]] = Register(
-            registers, 
-            instruction_str
-        )
 
-    return registers["a"].get_value()
+def part1(_in):
+    return _in.get(_in.evaluate(), "a")
 
 
 def part2(_in):
-
-    b_rule = f"{part1(_in)} -> b" 
-
-    _in = [instruction_str for instruction_str in _in if "-> b " not in instruction_str]
-    _in.append(b_rule)
-
-    registers = dict()
-    for instruction_str in _in:
-        registers[instruction_str.split(" -> ")[-1]] = Register(
-            registers, 
-            instruction_str
-        )
-
-    return registers["a"].get_value()
+    values = _in.evaluate()
+    values = _in.override(values, "b", _in.get(values, "a"))
+    return _in.get(values, "a")
 
 
 def benchmark(name: str, func, *_in) -> None:
@@ -86,7 +181,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
@@ -42,7 +42,7 @@ def get_distances(routes: dict) -> list[int]:
 
     return distances
 
-def part1(_in):
+def prepare(_in):
     routes = dict()
     for line in _in:
         source, part2 = line.split(" to ")
@@ -58,25 +58,14 @@ def part1(_in):
             routes[dest] = dict()
         routes[dest][source] = dist
 
-    return min(get_distances(routes))
+    # Both parts only differ in min/max over all of the route distances
+    return get_distances(routes)
 
-def part2(_in):
-    routes = dict()
-    for line in _in:
-        source, part2 = line.split(" to ")
-        dest, dist = part2.split(" = ")
-        dist = int(dist)
-
-        if routes.get(source) is None:
-            routes[source] = dict()
-        routes[source][dest] = dist
-
-
-        if routes.get(dest) is None:
-            routes[dest] = dict()
-        routes[dest][source] = dist
+def part1(distances):
+    return min(distances)
 
-    return max(get_distances(routes))
+def part2(distances):
+    return max(distances)
 
 
 def benchmark(name: str, func, *_in) -> None:
@@ -90,7 +79,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
@@ -10,6 +10,20 @@ from sys import argv
 from datetime import datetime
 
 
+def prepare(_in):
+    """
+    Optional stage for the work shared by both parts (e.g. precomputed distances).
+    Runs once, its result is passed to part1 and part2.
+
+    Parameters:
+        _in: The parsed input returned by get_input.
+
+    Returns:
+        The input for both parts.
+    """
+    return _in
+
+
 def part1(_in):
     pass
 
@@ -47,8 +61,8 @@ def benchmark(name: str, func, *_in) -> None:
 
 def main() -> None:
     """
-    Reads command-line argument for the input file name, processes both parts,
-    and prints their results and timings.
+    Reads command-line argument for the input file name, prepares the input,
+    processes both parts, and prints their results and timings.
 
     Returns:
         None
@@ -56,7 +70,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
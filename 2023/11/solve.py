@@ -34,7 +34,7 @@ def get_number_of_elements_between(el: list[int], x1:int, x2: int):
     return max_x_i - min_x_i
 
 
-def get_galaxy_score(_in, mul):
+def prepare(_in):
     empty_rows = [
         y
         for y, row in enumerate(_in)
@@ -57,6 +57,12 @@ def get_galaxy_score(_in, mul):
         if _in[y][x] == "#"
     ]
 
+    return empty_rows, empty_cols, gs
+
+
+def get_galaxy_score(_in, mul):
+    empty_rows, empty_cols, gs = _in
+
     return sum(
         abs(gs[i][0] - gs[j][0]) 
         + abs(gs[i][1] - gs[j][1])
@@ -90,7 +96,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
@@ -10,7 +10,7 @@ def get_input(filename: str):
     return _in
 
 
-def get_galaxy_score(_in, i):
+def get_galaxy_score(_in):
     gs = [
         (y, x)
         for y in range(len(_in))
@@ -74,7 +74,17 @@ def get_circuit(connections, start_id: int) -> int:
     return visited_nodes
 
 
-def part1(junction_boxes):
+def prepare(junction_boxes):
+    """
+    Precomputes all possible connections sorted by distance, which both parts
+    process in the same order.
+
+    Parameters:
+        junction_boxes (list[JunctionBox]): The parsed junction boxes.
+
+    Returns:
+        tuple: The junction boxes and the sorted (id_from, id_to, distance) connections.
+    """
     # Precompute all possible connections
     possible_connections = [
         (
@@ -88,6 +98,12 @@ def part1(junction_boxes):
     # Sort them by distance
     possible_connections.sort(key=lambda x: x[2])
 
+    return junction_boxes, possible_connections
+
+
+def part1(_in):
+    junction_boxes, possible_connections = _in
+
     # Adjacency list for the graph
     connections = {
         _id: []
@@ -124,19 +140,8 @@ def part1(junction_boxes):
     return reduce(lambda x, y: x * y, circuit_sizes[:3])
 
 
-def part2(junction_boxes):
-    # Precompute all possible connections
-    possible_connections = [
-        (
-            i,
-            j,
-            junction_boxes[i].distance_to(junction_boxes[j])
-        )
-        for i in range(len(junction_boxes))
-        for j in range(i+1, len(junction_boxes))
-    ]
-    # Sort them by distance
-    possible_connections.sort(key=lambda x: x[2])
+def part2(_in):
+    junction_boxes, possible_connections = _in
 
     # Adjacency list for the graph
     connections = {
@@ -194,8 +199,8 @@ def benchmark(name: str, func, *_in) -> None:
 
 def main() -> None:
     """
-    Reads command-line argument for the input file name, processes both parts,
-    and prints their results and timings.
+    Reads command-line argument for the input file name, prepares the input,
+    processes both parts, and prints their results and timings.
 
     Returns:
         None
@@ -203,7 +208,7 @@ def main() -> None:
     if len(argv) < 2:
         print("Provide the file name")
         return
-    _in = get_input(argv[1])
+    _in = prepare(get_input(argv[1]))
     benchmark("PART 1", part1, _in)
     benchmark("PART 2", part2, _in)
 
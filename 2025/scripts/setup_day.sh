@@ -22,13 +22,12 @@ ALL_DAYS_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )"/.. && pwd )"
 ASCII_ART_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )"/ascii-responses && pwd )"
 mkdir -p "$ASCII_ART_DIR"
 
+# Served from the cache of aoc.fetch if the input was prefetched
+# (python -m aoc.fetch get YEAR), downloaded and cached otherwise
 fetch_input() {
   year=$1
   day=$2
-  index="https://adventofcode.com/$year/day/$day"
-  curl "$index/input" \
-    -b "$COOKIE" \
-    -H "referer: $index"
+  ( cd "$ALL_DAYS_DIR/.." && AOC_COOKIE="$COOKIE" python3 -m aoc.fetch get "$year/$day" --stdout )
 }
 
 day=`seq 1 25 | fzf --height 20 --border --reverse`
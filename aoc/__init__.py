@@ -0,0 +1,15 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Shared tooling for the Advent of Code solutions.
+#
+# The per-day solutions stay self-contained scripts (`python solve.py input.txt`);
+# everything in this package operates on them from the outside or is imported
+# explicitly by the days that want it.
+#
+# Usage: python -m aoc.bench [year | year/day ...]
+# --------------------------------------------------------------------------------------
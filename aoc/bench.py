@@ -0,0 +1,497 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Repository-wide benchmark runner.
+#
+# Replaces the single `datetime.now()` measurement of the per-day `benchmark()` helper
+# with repeated `time.perf_counter_ns()` runs and reports min/median/p95 for every
+# part, so days, years and commits can be compared with each other.
+#
+# Template days are timed per stage: `parse` (get_input), the optional `prepare`
+# (work shared by both parts), `part1` and `part2`.
+# Legacy days (2021, early 2022) are timed as a whole script under the `main` stage.
+# Every part receives its own deep copy of the parsed input, as some of the parts
+# (e.g. 2025/4 part2) modify it in place.
+#
+# With per-part budgets every stage runs in a forked child process (see aoc.isolation),
+# an overrun is killed and recorded, and the remaining parts and days still run.
+#
+# Usage: python -m aoc.bench [year | year/day ...] [-n REPEAT] [-w WARMUP]
+#                            [--input FILENAME] [--json FILE] [--save]
+#                            [-j JOBS] [--timeout SECONDS] [--cache-inputs]
+#                            [--profile] [--profile-top N]
+#                            [--memory] [--memory-budget SIZE] [--import-time]
+#                            [--part-timeout SECONDS] [--part-memory SIZE]
+# --------------------------------------------------------------------------------------
+
+import argparse
+import io
+import json
+import runpy
+import signal
+import sys
+from contextlib import contextmanager, redirect_stdout
+from copy import deepcopy
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from statistics import median
+from time import perf_counter_ns
+from typing import Callable
+
+from aoc import history, isolation, memory, profiling
+from aoc.cache import cached_input
+from aoc.discovery import Day, discover, load_module, target_argument, working_directory
+
+
+OK = "ok"
+ERROR = "error"
+SKIPPED = "skipped"
+TIMEOUT = "timeout"
+OVER_BUDGET = "over-budget"
+
+
+class DayTimeout(BaseException):
+    """
+    Raised inside of a running day when its time limit is exceeded. It is not an
+    `Exception`, so that the per-stage error handling does not swallow it.
+    """
+
+
+@dataclass
+class Options:
+    input_name: str = "input.txt"
+    repeat: int = 5
+    warmup: int = 1
+    # Wall-clock limit in seconds for a whole day
+    timeout: float | None = None
+    # Load the parsed inputs from the on-disk cache (see aoc.cache)
+    cache_inputs: bool = False
+    # Profile every stage into this directory (see aoc.profiling)
+    profile_dir: Path | None = None
+    profile_top: int = 15
+    # Record the tracemalloc peak, the RSS and the top allocation sites (see aoc.memory)
+    memory: bool = False
+    # Fail the stages whose tracemalloc peak exceeds this many bytes
+    memory_budget: int | None = None
+    # Measure the import cost in a fresh interpreter (see aoc.imports)
+    import_time: bool = False
+    # Budgets of every stage: the timeout applies to each of its runs (warmup, measured,
+    # profiled, memory) and the memory to all of them; either one isolates the stages
+    part_timeout: float | None = None
+    part_memory: int | None = None
+
+    @property
+    def isolated(self) -> bool:
+        return self.part_timeout is not None or self.part_memory is not None
+
+
+@dataclass
+class Timing:
+    year: int
+    day: int
+    part: str
+    samples: list[int] = field(default_factory=list)
+    answer: str | None = None
+    status: str = OK
+    error: str | None = None
+    peak_bytes: int | None = None
+    rss_bytes: int | None = None
+    alloc_sites: list[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day}/{self.part}"
+
+    @property
+    def has_result(self) -> bool:
+        """
+        Whether all runs finished, also when only the peak exceeded `--memory-budget`
+        (an allocation failing under `--part-memory` leaves no samples).
+        """
+        return self.status == OK or (self.status == OVER_BUDGET and bool(self.samples))
+
+    @property
+    def min_ns(self) -> int | None:
+        return min(self.samples) if self.samples else None
+
+    @property
+    def median_ns(self) -> float | None:
+        return median(self.samples) if self.samples else None
+
+    @property
+    def p95_ns(self) -> int | None:
+        return percentile(self.samples, 95) if self.samples else None
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "min_ns": self.min_ns,
+            "median_ns": self.median_ns,
+            "p95_ns": self.p95_ns,
+        }
+
+
+def percentile(samples: list[int], q: float) -> int:
+    """
+    Nearest-rank percentile, which always returns one of the measured samples.
+
+    Parameters:
+        samples (list[int]): The measured samples.
+        q (float): The percentile in the range (0, 100].
+
+    Returns:
+        int: The sample at the given percentile.
+    """
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def measure(func: Callable, make_args: Callable[[], tuple], repeat: int, warmup: int) -> tuple[list[int], object, str]:
+    """
+    Times `func` over `warmup + repeat` calls, discarding the warmup samples.
+    Arguments are created by `make_args` before the clock starts, so copying the
+    input is never part of the measurement. Output printed by the solution is captured,
+    only the one of the last call is kept.
+
+    Parameters:
+        func (callable): The function to benchmark.
+        make_args (callable): Factory returning a fresh tuple of arguments for each call.
+        repeat (int): The number of measured calls.
+        warmup (int): The number of unmeasured calls made beforehand.
+
+    Returns:
+        tuple[list[int], object, str]: The measured samples in nanoseconds, and the result
+            and the printed output of the last call.
+    """
+    samples = []
+    result = None
+    output = io.StringIO()
+    for i in range(warmup + repeat):
+        args = make_args()
+        output.seek(0)
+        output.truncate()
+        with redirect_stdout(output):
+            start = perf_counter_ns()
+            result = func(*args)
+            elapsed = perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples, result, output.getvalue()
+
+
+def run_stage(timing: Timing, func: Callable, make_args: Callable[[], tuple], options: Options) -> object:
+    try:
+        timing.samples, result, output = measure(func, make_args, options.repeat, options.warmup)
+    except MemoryError as e:
+        # Raised by the address space limit of an isolated stage
+        timing.status = OVER_BUDGET if options.part_memory is not None else ERROR
+        timing.error = f"MemoryError: {e}"
+        return None
+    except Exception as e:
+        timing.status = ERROR
+        timing.error = f"{type(e).__name__}: {e}"
+        return None
+    # Some parts (e.g. 2022/11-14) print their answer, after any progress, instead of returning it
+    printed = output.strip().split("\n")[-1].strip()
+    timing.answer = printed if result is None and printed else str(result)
+
+    if options.profile_dir is not None:
+        directory = options.profile_dir / str(timing.year) / str(timing.day)
+        prof_path, _ = profiling.profile_stage(func, make_args, directory, timing.part)
+        print(f"== {timing.key} ==", file=sys.stderr)
+        print(profiling.top_functions(prof_path, options.profile_top), file=sys.stderr)
+
+    if options.memory or options.memory_budget is not None:
+        usage = memory.measure_memory(func, make_args)
+        timing.peak_bytes = usage.peak_bytes
+        timing.rss_bytes = usage.rss_bytes
+        timing.alloc_sites = usage.top_sites
+        print(f"== {timing.key} top allocations ==", file=sys.stderr)
+        print("\n".join(usage.top_sites), file=sys.stderr)
+        if options.memory_budget is not None and usage.peak_bytes > options.memory_budget:
+            timing.status = OVER_BUDGET
+            timing.error = f"peak {memory.format_size(usage.peak_bytes)} MB exceeds the budget"
+
+    return result
+
+
+def run_isolated_stage(timing: Timing, func: Callable, make_args: Callable[[], tuple], options: Options, keep_result: bool) -> object:
+    def budgeted(*args):
+        # Every call of the stage gets the whole timeout
+        isolation.restart_budget()
+        return func(*args)
+
+    def stage() -> tuple[Timing, object]:
+        result = run_stage(timing, budgeted, make_args, options)
+        return timing, (result if keep_result else None)
+
+    try:
+        child_timing, result = isolation.run_isolated(stage, options.part_timeout, options.part_memory)
+    except isolation.StageTimeout:
+        timing.status = TIMEOUT
+        timing.error = f"exceeded {options.part_timeout}s"
+        return None
+    except isolation.StageCrashed as e:
+        timing.status = ERROR
+        timing.error = str(e)
+        return None
+
+    vars(timing).update(vars(child_timing))
+    return result
+
+
+def execute_stage(timing: Timing, func: Callable, make_args: Callable[[], tuple], options: Options, keep_result: bool = True) -> object:
+    """
+    Runs the stage in this process, or in a child process when the options set budgets.
+    Only the results needed by the following stages (`keep_result`) are sent back.
+    """
+    if options.isolated:
+        return run_isolated_stage(timing, func, make_args, options, keep_result)
+    return run_stage(timing, func, make_args, options)
+
+
+def run_import_stage(day: Day) -> Timing:
+    # Imported here, as aoc.imports is only needed with --import-time
+    from aoc.imports import measure_imports
+
+    timing = Timing(day.year, day.day, "import")
+    try:
+        report = measure_imports(day)
+    except RuntimeError as e:
+        timing.status = ERROR
+        timing.error = str(e)
+        return timing
+
+    timing.samples = [report.total_us * 1000]
+    timing.answer = ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in report.modules[:3])
+    return timing
+
+
+def run_template_day(day: Day, options: Options) -> list[Timing]:
+    timings = [run_import_stage(day)] if options.import_time else []
+
+    module = load_module(day.path)
+    input_path = str(day.input_path(options.input_name))
+
+    get_input = module.get_input
+    if options.cache_inputs:
+        get_input = cached_input(get_input)
+
+    parse = Timing(day.year, day.day, "parse")
+    _in = execute_stage(parse, get_input, lambda: (input_path,), options)
+    # The parsed input is not an answer
+    parse.answer = None
+    timings.append(parse)
+    last = parse
+
+    prepare = getattr(module, "prepare", None)
+    if prepare is not None:
+        timing = Timing(day.year, day.day, "prepare")
+        if last.has_result:
+            _in = execute_stage(timing, prepare, lambda: (deepcopy(_in),), options)
+            timing.answer = None
+        else:
+            timing.status = SKIPPED
+            timing.error = "parsing failed"
+        timings.append(timing)
+        last = timing
+
+    for part in ("part1", "part2"):
+        timing = Timing(day.year, day.day, part)
+        if last.has_result:
+            execute_stage(timing, getattr(module, part), lambda: (deepcopy(_in),), options, keep_result=False)
+        else:
+            timing.status = SKIPPED
+            timing.error = f"{last.part} failed"
+        timings.append(timing)
+
+    return timings
+
+
+def run_legacy_day(day: Day, options: Options) -> list[Timing]:
+    timing = Timing(day.year, day.day, "main")
+    output = io.StringIO()
+
+    def run_script() -> str:
+        output.seek(0)
+        output.truncate()
+        with redirect_stdout(output):
+            runpy.run_path(str(day.path), run_name="__main__")
+        return output.getvalue().strip()
+
+    execute_stage(timing, run_script, tuple, options, keep_result=False)
+    return [timing]
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """
+    Raises `DayTimeout` in the current (main) thread after the given number of seconds.
+    Based on SIGALRM, so a solution stuck inside a single C call (e.g. a huge NumPy
+    operation) is only interrupted once it returns to Python.
+    """
+    if not seconds:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise DayTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_day(day: Day, options: Options = Options()) -> list[Timing]:
+    """
+    Benchmarks every stage of a single day.
+
+    Parameters:
+        day (Day): The day to benchmark.
+        options (Options): The benchmark settings.
+
+    Returns:
+        list[Timing]: One timing per stage.
+    """
+    if not day.input_path(options.input_name).is_file():
+        return [Timing(day.year, day.day, "main", status=SKIPPED, error=f"no {options.input_name}")]
+
+    with working_directory(day.directory):
+        try:
+            with time_limit(options.timeout):
+                if day.is_template:
+                    return run_template_day(day, options)
+                return run_legacy_day(day, options)
+        except DayTimeout:
+            return [Timing(day.year, day.day, "main", status=TIMEOUT, error=f"exceeded {options.timeout}s")]
+        except Exception as e:
+            # Import-time failures, e.g. a missing dependency
+            return [Timing(day.year, day.day, "main", status=ERROR, error=f"{type(e).__name__}: {e}")]
+
+
+def format_ns(ns: float | None) -> str:
+    if ns is None:
+        return "-"
+    return f"{ns / 1_000_000:.3f}"
+
+
+def format_table(timings: list[Timing]) -> str:
+    with_memory = any(t.peak_bytes is not None for t in timings)
+
+    header = ("day", "part", "min ms", "median ms", "p95 ms")
+    if with_memory:
+        header += ("peak MB", "rss MB")
+    header += ("status", "answer")
+
+    rows = []
+    for t in timings:
+        row = (
+            f"{t.year}/{t.day}",
+            t.part,
+            format_ns(t.min_ns),
+            format_ns(t.median_ns),
+            format_ns(t.p95_ns),
+        )
+        if with_memory:
+            row += (memory.format_size(t.peak_bytes), memory.format_size(t.rss_bytes))
+        row += (
+            t.status,
+            # Legacy days print both answers on separate lines
+            ((t.answer if t.status == OK else t.error) or "").replace("\n", " | "),
+        )
+        rows.append(row)
+    widths = [
+        max(len(str(row[i])) for row in [header, *rows])
+        for i in range(len(header))
+    ]
+    lines = [
+        "  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in [header, *rows]
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.bench", description="Benchmark the Advent of Code solutions.")
+    parser.add_argument("targets", type=target_argument, nargs="*", help='days to run, e.g. "2015" or "2015/4" (default: all)')
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="measured runs per part")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="unmeasured runs per part")
+    parser.add_argument("--input", default="input.txt", help="input file name inside each day directory")
+    parser.add_argument("--json", metavar="FILE", help='write the results as JSON ("-" for stdout)')
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="run days in parallel processes (0 = one per CPU)")
+    parser.add_argument("--timeout", type=float, help="wall-clock limit in seconds per day")
+    parser.add_argument("--cache-inputs", action="store_true", help="cache the parsed inputs on disk (see aoc.cache)")
+    parser.add_argument("--profile", action="store_true", help=f"write cProfile and flame graph profiles to {profiling.PROFILE_DIR.name}/")
+    parser.add_argument("--profile-top", type=int, default=15, help="functions listed per profiled part")
+    parser.add_argument("--memory", action="store_true", help="record the peak memory and the top allocation sites")
+    parser.add_argument("--memory-budget", type=memory.parse_size, metavar="SIZE",
+                        help='fail parts whose peak memory exceeds SIZE, e.g. "512M" (implies --memory)')
+    parser.add_argument("--import-time", action="store_true", help="report the import cost of every day (-X importtime)")
+    parser.add_argument("--part-timeout", type=float, metavar="SECONDS",
+                        help="kill parts running longer than SECONDS per run (runs every part in a child process)")
+    parser.add_argument("--part-memory", type=memory.parse_size, metavar="SIZE",
+                        help='limit the memory every part may allocate, e.g. "1G" (runs every part in a child process)')
+    parser.add_argument("--save", action="store_true", help=f"append the results to the history ({history.HISTORY_FILE.name})")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+
+    options = Options(
+        input_name=args.input,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        timeout=args.timeout,
+        cache_inputs=args.cache_inputs,
+        profile_dir=profiling.PROFILE_DIR if args.profile else None,
+        profile_top=args.profile_top,
+        memory=args.memory,
+        memory_budget=args.memory_budget,
+        import_time=args.import_time,
+        part_timeout=args.part_timeout,
+        part_memory=args.part_memory,
+    )
+
+    days = discover(targets=args.targets)
+    if args.jobs != 1:
+        # Imported here, as aoc.parallel builds on this module
+        from aoc.parallel import run_parallel
+        timings = run_parallel(days, options, args.jobs or None)
+    else:
+        timings = []
+        for day in days:
+            print(f"Running {day.key}...", file=sys.stderr)
+            timings += run_day(day, options)
+
+    if args.save:
+        saved = history.append(timings, days, args.input)
+        print(f"Saved {saved} records to {history.HISTORY_FILE}", file=sys.stderr)
+
+    if args.json:
+        data = json.dumps([t.to_dict() for t in timings], indent=2)
+        if args.json == "-":
+            print(data)
+        else:
+            with open(args.json, "w") as f:
+                f.write(data)
+
+    if args.json != "-":
+        print(format_table(timings))
+
+    if any(t.status == OVER_BUDGET for t in timings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
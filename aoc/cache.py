@@ -0,0 +1,166 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# On-disk cache of parsed inputs.
+#
+# `cached_input` wraps a `get_input(filename)` function and stores its result keyed by
+# the hash of the input file and the hash of the source file defining the parser, so
+# editing either the input or the solution invalidates the entry. NumPy arrays are
+# stored as `.npy`, everything else is pickled. The cache directory is bounded in size
+# and evicts the least recently used entries first.
+#
+# Usage:
+#   python -m aoc.bench --cache-inputs      (wraps every template day's get_input)
+#
+#   from aoc.cache import cached_input
+#
+#   @cached_input
+#   def get_input(filename: str): ...
+# --------------------------------------------------------------------------------------
+
+import inspect
+import os
+import pickle
+from functools import wraps
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable
+
+from aoc.discovery import REPO_ROOT
+
+
+CACHE_DIR = REPO_ROOT / ".cache" / "inputs"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+PICKLE_SUFFIX = ".pkl"
+NUMPY_SUFFIX = ".npy"
+
+
+def source_hash(func: Callable) -> str:
+    """
+    Hashes the whole file defining the parser rather than just the function, as
+    parsers usually depend on other classes and helpers of the same solution.
+    """
+    try:
+        with open(inspect.getsourcefile(func), "rb") as f:
+            return sha256(f.read()).hexdigest()
+    except (TypeError, OSError):
+        return sha256(func.__qualname__.encode()).hexdigest()
+
+
+def cache_key(filename: str, func: Callable) -> str:
+    with open(filename, "rb") as f:
+        input_hash = sha256(f.read()).hexdigest()
+    return sha256((input_hash + source_hash(func)).encode()).hexdigest()[:32]
+
+
+def is_numpy_array(value) -> bool:
+    # Checked by name, so that NumPy is never imported by the cache itself
+    return type(value).__module__ == "numpy" and type(value).__name__ == "ndarray"
+
+
+def read_entry(path: Path):
+    if path.suffix == NUMPY_SUFFIX:
+        import numpy as np
+        return np.load(path, allow_pickle=False)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def write_entry(directory: Path, key: str, value) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+
+    numpy_array = is_numpy_array(value) and value.dtype != object
+    path = directory / (key + (NUMPY_SUFFIX if numpy_array else PICKLE_SUFFIX))
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            if numpy_array:
+                import numpy as np
+                np.save(f, value, allow_pickle=False)
+            else:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        # E.g. an unpicklable value; `evict` does not know the partial files
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+    # Atomic, so a parallel benchmark never reads a half-written entry
+    os.replace(tmp_path, path)
+    return path
+
+
+def evict(directory: Path, max_bytes: int) -> None:
+    """
+    Removes the least recently used entries until the directory fits into `max_bytes`.
+    Hits refresh the modification time of an entry, which is used as the LRU order.
+    """
+    entries = [
+        (path.stat().st_mtime, path.stat().st_size, path)
+        for path in directory.iterdir()
+        if path.suffix in (PICKLE_SUFFIX, NUMPY_SUFFIX)
+    ]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def lookup(directory: Path, key: str) -> Path | None:
+    for suffix in (NUMPY_SUFFIX, PICKLE_SUFFIX):
+        path = directory / (key + suffix)
+        if path.is_file():
+            return path
+    return None
+
+
+def cached_input(func: Callable | None = None, *, directory: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+    """
+    Decorator caching the result of a `get_input(filename)` function on disk.
+
+    Parameters:
+        func (callable): The parser, when used as a bare `@cached_input`.
+        directory (Path): The cache directory.
+        max_bytes (int): The size limit of the cache directory.
+
+    Returns:
+        callable: The wrapped parser.
+    """
+    def decorator(parser: Callable) -> Callable:
+        @wraps(parser)
+        def wrapper(filename: str):
+            key = cache_key(filename, parser)
+
+            path = lookup(directory, key)
+            if path is not None:
+                try:
+                    value = read_entry(path)
+                    os.utime(path)
+                    return value
+                except Exception:
+                    # Corrupted or unloadable entry, parse again
+                    path.unlink(missing_ok=True)
+
+            value = parser(filename)
+            try:
+                write_entry(directory, key, value)
+                evict(directory, max_bytes)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # Not every parsed input can be pickled (e.g. lambdas), just skip caching it
+                pass
+            return value
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,224 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Cycle detection and fast-forwarding of long simulations.
+#
+# "Run it 10^9 (or 10^12) times" puzzles are solved by finding the step at which the
+# simulation starts repeating. 2023/14 part2 keeps the board hashes in a list and
+# calls `index()` on it every cycle, 2023/8 `get_cycle_data` searches `visited[:-1]`
+# every step, and 2022/17 part2 has no detection at all. Here:
+#   - `find_cycle` remembers the fingerprint of every state in a dict (O(1) lookups),
+#   - `brent` uses Brent's algorithm, keeping only two states in memory,
+#   - `fast_forward` jumps to any target step and extrapolates an accumulated metric
+#     (e.g. the tower height of 2022/17), which grows by the same amount every cycle.
+#
+# The fingerprint must capture everything which determines the future of the state, but
+# may leave out the accumulated parts (the absolute height), so that the states repeat.
+#
+# Usage:
+#   from aoc.cycles import fast_forward
+#
+#   board, load = fast_forward(board, spin_cycle, 1_000_000_000, key=np.ndarray.tobytes, metric=get_load)
+# --------------------------------------------------------------------------------------
+
+from dataclasses import dataclass
+from itertools import count
+from typing import Callable, Hashable, TypeVar
+
+
+State = TypeVar("State")
+
+
+def identity(state):
+    return state
+
+
+@dataclass(frozen=True)
+class Cycle:
+    # The first step of the repeating part
+    start: int
+    # The number of steps after which the states repeat
+    length: int
+
+    def equivalent(self, step: int) -> int:
+        """
+        Maps any step to the step of the first pass through the cycle with the same state.
+        """
+        if step < self.start:
+            return step
+        return self.start + (step - self.start) % self.length
+
+    def repetitions(self, step: int) -> int:
+        """
+        The number of whole cycles completed before the given step.
+        """
+        if step < self.start:
+            return 0
+        return (step - self.start) // self.length
+
+
+def find_cycle(
+    initial: State,
+    step: Callable[[State], State],
+    key: Callable[[State], Hashable] = identity,
+    limit: int | None = None,
+) -> Cycle | None:
+    """
+    Finds the cycle by storing the fingerprint of every state in a dict. The step may
+    modify the state in place, as only the fingerprints are kept.
+
+    Parameters:
+        initial (State): The state at step 0.
+        step (callable): Returns the state following the given one.
+        key (callable): The hashable fingerprint of a state, e.g. `np.ndarray.tobytes`.
+        limit (int | None): Give up after this many steps.
+
+    Returns:
+        Cycle | None: The cycle, None if none was found within the limit.
+    """
+    seen = {}
+    state = initial
+    for i in count():
+        if limit is not None and i > limit:
+            return None
+        fingerprint = key(state)
+        if fingerprint in seen:
+            return Cycle(seen[fingerprint], i - seen[fingerprint])
+        seen[fingerprint] = i
+        state = step(state)
+
+
+def brent(
+    initial: State,
+    step: Callable[[State], State],
+    key: Callable[[State], Hashable] = identity,
+    limit: int | None = None,
+) -> Cycle | None:
+    """
+    Finds the cycle with Brent's algorithm in O(1) memory and at most about three times
+    the steps of `find_cycle`. The step must return a new state without modifying the
+    given one, as several states are advanced independently.
+
+    Parameters:
+        initial (State): The state at step 0.
+        step (callable): Returns the state following the given one.
+        key (callable): The fingerprint of a state, compared with ==.
+        limit (int | None): Give up after this many steps.
+
+    Returns:
+        Cycle | None: The cycle, None if none was found within the limit.
+    """
+    # Find the length: the tortoise waits at powers of two for the hare to come around
+    power = length = 1
+    tortoise = initial
+    hare = step(initial)
+    steps = 1
+    while key(tortoise) != key(hare):
+        if limit is not None and steps > limit:
+            return None
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+        steps += 1
+
+    # Find the start: two states `length` steps apart meet at its first step
+    tortoise = hare = initial
+    for _ in range(length):
+        hare = step(hare)
+    start = 0
+    while key(tortoise) != key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+
+    return Cycle(start, length)
+
+
+def advance(state: State, step: Callable[[State], State], steps: int) -> State:
+    for _ in range(steps):
+        state = step(state)
+    return state
+
+
+def fast_forward(
+    initial: State,
+    step: Callable[[State], State],
+    target: int,
+    key: Callable[[State], Hashable] = identity,
+    metric: Callable[[State], int] | None = None,
+    method: str = "dict",
+) -> tuple[State, int | None]:
+    """
+    Computes the state at the target step, skipping the whole cycles.
+
+    Parameters:
+        initial (State): The state at step 0.
+        step (callable): Returns the state following the given one.
+        target (int): The step to reach, e.g. 10**12.
+        key (callable): The fingerprint of a state.
+        metric (callable | None): A value of the state which either repeats with it
+            (e.g. the 2023/14 load) or grows by the same amount every cycle (e.g. the
+            2022/17 height); it is extrapolated to the target.
+        method (str): "dict" (`find_cycle`, the step may work in place) or "brent"
+            (`brent`, O(1) memory, the step must not modify its argument).
+
+    Returns:
+        tuple[State, int | None]: A state with the fingerprint of the target step, and
+            the metric at the target step (None without a metric).
+    """
+    if method == "brent":
+        return fast_forward_brent(initial, step, target, key, metric)
+    if method != "dict":
+        raise ValueError(f"Unknown method: {method}")
+
+    seen = {}
+    metrics = []
+    state = initial
+    for i in count():
+        value = metric(state) if metric is not None else None
+        if i == target:
+            return state, value
+        fingerprint = key(state)
+        if fingerprint in seen:
+            break
+        seen[fingerprint] = i
+        metrics.append(value)
+        state = step(state)
+
+    cycle = Cycle(seen[fingerprint], i - seen[fingerprint])
+    # The current state is the one at cycle.start, one cycle later
+    offset = cycle.equivalent(target) - cycle.start
+    state = advance(state, step, offset)
+    if metric is None:
+        return state, None
+
+    growth = value - metrics[cycle.start]
+    return state, metrics[cycle.start + offset] + cycle.repetitions(target) * growth
+
+
+def fast_forward_brent(
+    initial: State,
+    step: Callable[[State], State],
+    target: int,
+    key: Callable[[State], Hashable],
+    metric: Callable[[State], int] | None,
+) -> tuple[State, int | None]:
+    cycle = brent(initial, step, key)
+    if target < cycle.start:
+        state = advance(initial, step, target)
+        return state, metric(state) if metric is not None else None
+
+    first = advance(initial, step, cycle.start)
+    state = advance(first, step, cycle.equivalent(target) - cycle.start)
+    if metric is None:
+        return state, None
+
+    growth = metric(advance(first, step, cycle.length)) - metric(first)
+    return state, metric(state) + cycle.repetitions(target) * growth
@@ -0,0 +1,245 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Resident solver daemon.
+#
+# Starting Python and importing NumPy takes longer than solving most of the days.
+# The daemon is a long-lived process keeping NumPy and the solution modules imported,
+# accepting "run year/day on file" requests over a Unix socket. A solution module is
+# re-imported only when the modification time of its file changes, and memoized
+# functions (`@lru_cache`) are cleared before every run, so the answers and timings
+# never come from a previous request.
+#
+# The protocol is a single JSON line in each direction per connection.
+#
+# Usage: python -m aoc.daemon serve [--socket PATH]
+#        python -m aoc.daemon run 2025/4 [2015 ...] [--part 1] [--input FILE]
+#        python -m aoc.daemon stop
+# --------------------------------------------------------------------------------------
+
+import argparse
+import io
+import json
+import os
+import runpy
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter_ns
+from types import ModuleType
+
+from aoc.discovery import Day, discover, load_module, target_argument, working_directory
+
+
+SOCKET_PATH = Path(tempfile.gettempdir()) / f"aoc-daemon-{os.getuid()}.sock"
+
+# Imported once when the daemon starts, as most of the NumPy days need them
+WARM_MODULES = ("numpy",)
+
+
+class ModuleCache:
+    """
+    Solution modules keyed by their path, reloaded when the file changes.
+    """
+
+    def __init__(self) -> None:
+        self.modules: dict[Path, tuple[float, ModuleType]] = {}
+
+    def get(self, path: Path) -> ModuleType:
+        mtime = path.stat().st_mtime
+        cached = self.modules.get(path)
+        if cached is None or cached[0] != mtime:
+            self.modules[path] = (mtime, load_module(path))
+        module = self.modules[path][1]
+
+        for value in vars(module).values():
+            cache_clear = getattr(value, "cache_clear", None)
+            if callable(cache_clear):
+                cache_clear()
+
+        return module
+
+
+def timed(func, *args) -> tuple[object, int]:
+    with redirect_stdout(io.StringIO()):
+        start = perf_counter_ns()
+        result = func(*args)
+        elapsed = perf_counter_ns() - start
+    return result, elapsed
+
+
+def run_template(module: ModuleType, input_path: str, parts: list[int]) -> list[dict]:
+    def load():
+        _in = module.get_input(input_path)
+        prepare = getattr(module, "prepare", None)
+        return _in if prepare is None else prepare(_in)
+
+    _in, elapsed = timed(load)
+    # Includes the prepare stage, if the day has one
+    results = [{"part": "parse", "answer": None, "time_ns": elapsed}]
+
+    for i, part in enumerate(parts):
+        # Each part gets its own parsed input, as some of them modify it in place
+        if i > 0:
+            _in = load()
+        answer, elapsed = timed(getattr(module, f"part{part}"), _in)
+        results.append({"part": f"part{part}", "answer": str(answer), "time_ns": elapsed})
+
+    return results
+
+
+def run_script(day: Day) -> list[dict]:
+    def execute() -> str:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            runpy.run_path(str(day.path), run_name="__main__")
+        return output.getvalue().strip()
+
+    answer, elapsed = timed(execute)
+    return [{"part": "main", "answer": answer, "time_ns": elapsed}]
+
+
+def handle(request: dict, modules: ModuleCache) -> dict:
+    """
+    Runs the requested days.
+
+    Parameters:
+        request (dict): {"targets": [...], "parts": [1, 2], "input": "input.txt"}
+        modules (ModuleCache): The warm solution modules.
+
+    Returns:
+        dict: {"days": [{"day": "2025/4", "results": [...]} | {"day": ..., "error": ...}]}
+    """
+    input_name = request.get("input", "input.txt")
+    parts = request.get("parts") or [1, 2]
+
+    days = []
+    for day in discover(targets=request["targets"]):
+        input_path = day.input_path(input_name)
+        if not input_path.is_file():
+            days.append({"day": day.key, "error": f"no {input_name}"})
+            continue
+
+        try:
+            with working_directory(day.directory):
+                if day.is_template:
+                    results = run_template(modules.get(day.path), str(input_path), parts)
+                else:
+                    results = run_script(day)
+        except Exception as e:
+            days.append({"day": day.key, "error": f"{type(e).__name__}: {e}"})
+            continue
+        days.append({"day": day.key, "results": results})
+
+    return {"days": days}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        if request.get("command") == "stop":
+            self.wfile.write(b'{"stopped": true}\n')
+            # shutdown() waits for the serve_forever loop, which is running this handler
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        try:
+            response = handle(request, self.server.modules)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, path: Path) -> None:
+        self.modules = ModuleCache()
+        super().__init__(str(path), RequestHandler)
+
+
+def serve(path: Path = SOCKET_PATH) -> None:
+    for name in WARM_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    if path.exists():
+        path.unlink()
+
+    with DaemonServer(path) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever(poll_interval=0.1)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def request(payload: dict, path: Path = SOCKET_PATH) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        with client.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def print_response(response: dict) -> None:
+    if "error" in response:
+        print(f"error: {response['error']}")
+        return
+
+    for day in response["days"]:
+        if "error" in day:
+            print(f"{day['day']}: error: {day['error']}")
+            continue
+        for result in day["results"]:
+            answer = (result["answer"] or "").replace("\n", " | ")
+            print(f"({result['time_ns'] / 1e6:.3f} ms) {day['day']} {result['part'].upper()}: {answer}")
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.daemon", description="Warm resident solver process.")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="the Unix socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("serve", help="start the daemon in the foreground")
+    subparsers.add_parser("stop", help="stop a running daemon")
+
+    run_parser = subparsers.add_parser("run", help="run days in the daemon")
+    run_parser.add_argument("targets", type=target_argument, nargs="+", help='days to run, e.g. "2015" or "2025/4"')
+    run_parser.add_argument("--part", type=int, choices=(1, 2), action="append", help="run only the given part")
+    run_parser.add_argument("--input", default="input.txt", help="input file name inside the day directory")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket)
+        return
+
+    payload = (
+        {"command": "stop"}
+        if args.command == "stop"
+        else {"targets": args.targets, "parts": args.part, "input": args.input}
+    )
+    try:
+        response = request(payload, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("The daemon is not running, start it with: python -m aoc.daemon serve")
+        sys.exit(1)
+
+    if args.command == "run":
+        print_response(response)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Differential testing of alternate implementations of the same day.
+#
+# `solve.py` is the reference. The alternates are detected automatically:
+#   - sibling files `solve_*.py` (e.g. 2023/11 solve_naive.py, 2023/2 solve_golf.py),
+#     called through get_input/part1/part2 when they follow the template, or executed
+#     as a script reading `input.txt` and printing one answer per line otherwise
+#   - functions `X_dumb`, `X_naive` or `X_slow` defined next to `X` in solve.py
+#     (e.g. 2023/12 count_possibilities_dumb), swapped in for `X` while running the
+#     reference parts
+#
+# Every implementation runs on the same input, its answers must match the reference
+# and its time is reported as a speedup relative to the reference (> 1 is faster).
+# The timed unit of every part is prepare (if defined) + the part itself.
+#
+# Usage: python -m aoc.diff 2023/11 [--generate SCALE] [--seed 0] [-n 3] [--timeout 30]
+# --------------------------------------------------------------------------------------
+
+import argparse
+import io
+import runpy
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from copy import deepcopy
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from types import ModuleType
+from typing import Callable
+
+from aoc import generators
+from aoc.bench import DayTimeout, measure, time_limit
+from aoc.discovery import Day, discover, load_module, target_argument, working_directory
+
+
+VARIANT_SUFFIXES = ("_dumb", "_naive", "_slow")
+
+PARTS = ("part1", "part2")
+
+MATCH = "match"
+MISMATCH = "MISMATCH"
+ERROR = "error"
+TIMEOUT = "timeout"
+
+
+@dataclass
+class PartResult:
+    answer: str | None = None
+    median_ns: float | None = None
+    status: str = MATCH
+    error: str | None = None
+
+
+@dataclass
+class Implementation:
+    name: str
+    # Runs the given part on the input file and returns (answer, median_ns)
+    run: Callable[[str, str], tuple[str, float]]
+    results: dict[str, PartResult] = field(default_factory=dict)
+
+
+def template_runner(module: ModuleType, repeat: int, patches: dict[str, Callable] | None = None):
+    """
+    Creates a runner calling the template functions of the module, optionally with
+    some of its globals replaced for the duration of the call.
+    """
+    def run(part: str, input_path: str) -> tuple[str, float]:
+        originals = {name: getattr(module, name) for name in (patches or {})}
+        for name, function in (patches or {}).items():
+            setattr(module, name, function)
+
+        try:
+            _in = module.get_input(input_path)
+            prepare = getattr(module, "prepare", lambda x: x)
+            func = getattr(module, part)
+            samples, result, output = measure(lambda x: func(prepare(x)), lambda: (deepcopy(_in),), repeat, 0)
+        finally:
+            for name, function in originals.items():
+                setattr(module, name, function)
+            # Memoized functions would otherwise leak results between the implementations
+            for name in list(originals) + list(patches or {}):
+                cache_clear = getattr(getattr(module, name), "cache_clear", None)
+                if cache_clear is not None:
+                    cache_clear()
+
+        if result is None and output.split():
+            # The part printed its answer, the last word of the output
+            return output.split()[-1], median(samples)
+        return str(result), median(samples)
+
+    return run
+
+
+def script_runner(path: Path, repeat: int):
+    """
+    Creates a runner executing a standalone script in a temporary directory holding
+    the input as `input.txt`. The answer of part N is the last word of its N-th output line.
+    """
+    def run(part: str, input_path: str) -> tuple[str, float]:
+        with tempfile.TemporaryDirectory(prefix="aoc-diff-") as directory:
+            shutil.copy(input_path, Path(directory) / "input.txt")
+
+            def run_script() -> str:
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    runpy.run_path(str(path), run_name="__main__")
+                return output.getvalue()
+
+            with working_directory(Path(directory)):
+                samples, output, _ = measure(run_script, tuple, repeat, 0)
+
+        lines = [line.split()[-1] for line in output.split("\n") if line.split()]
+        index = PARTS.index(part)
+        if index >= len(lines):
+            raise ValueError(f"The script printed only {len(lines)} answer(s)")
+        # The whole script computes both parts, so both share the same time
+        return lines[index], median(samples)
+
+    return run
+
+
+def find_implementations(day: Day, repeat: int) -> list[Implementation]:
+    """
+    Finds the reference and all of the alternate implementations of the day.
+
+    Returns:
+        list[Implementation]: The reference first, then the alternates.
+    """
+    reference = load_module(day.path)
+    implementations = [Implementation(day.path.name, template_runner(reference, repeat))]
+
+    for name in dir(reference):
+        for suffix in VARIANT_SUFFIXES:
+            original = name.removesuffix(suffix)
+            if name.endswith(suffix) and callable(getattr(reference, original, None)):
+                implementations.append(Implementation(
+                    f"{day.path.name}:{name}",
+                    template_runner(reference, repeat, {original: getattr(reference, name)}),
+                ))
+
+    for path in sorted(day.directory.glob("solve_*.py")):
+        sibling = Day(day.year, day.day, path)
+        if sibling.is_template:
+            runner = template_runner(load_module(path), repeat)
+        else:
+            runner = script_runner(path, repeat)
+        implementations.append(Implementation(path.name, runner))
+
+    return implementations
+
+
+def run_implementations(implementations: list[Implementation], input_path: str, timeout: float | None) -> None:
+    reference = implementations[0]
+
+    for implementation in implementations:
+        for part in PARTS:
+            result = PartResult()
+            implementation.results[part] = result
+            print(f"Running {implementation.name} {part}...", file=sys.stderr)
+            try:
+                with time_limit(timeout):
+                    result.answer, result.median_ns = implementation.run(part, input_path)
+            except DayTimeout:
+                result.status = TIMEOUT
+                result.error = f"exceeded {timeout}s"
+                continue
+            except Exception as e:
+                result.status = ERROR
+                result.error = f"{type(e).__name__}: {e}"
+                continue
+
+            expected = reference.results[part]
+            if expected.status == MATCH and result.answer != expected.answer:
+                result.status = MISMATCH
+                result.error = f"expected {expected.answer}"
+
+
+def format_results(implementations: list[Implementation]) -> str:
+    reference = implementations[0]
+    header = ["implementation", "part", "median ms", "speedup", "status", "answer"]
+    rows = []
+    for implementation in implementations:
+        for part, result in implementation.results.items():
+            reference_ns = reference.results[part].median_ns
+            speedup = (
+                f"{reference_ns / result.median_ns:.3g}x"
+                if reference_ns and result.median_ns
+                else "-"
+            )
+            rows.append([
+                implementation.name,
+                part,
+                "-" if result.median_ns is None else f"{result.median_ns / 1e6:.3f}",
+                speedup,
+                result.status,
+                (result.answer if result.status == MATCH else result.error) or "",
+            ])
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in [header, *rows]
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.diff", description="Compare the alternate implementations of a day.")
+    parser.add_argument("targets", type=target_argument, nargs="+", help='days to compare, e.g. "2023/11"')
+    parser.add_argument("--input", default="input.txt", help="input file name inside the day directory")
+    parser.add_argument("--generate", type=float, metavar="SCALE", help="use a generated input of the given scale instead")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the generator")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="measured runs per part")
+    parser.add_argument("--timeout", type=float, help="wall-clock limit in seconds per implementation and part")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    mismatches = False
+
+    for day in discover(targets=args.targets):
+        if not day.is_template:
+            print(f"{day.key}: not a template solution, skipping", file=sys.stderr)
+            continue
+
+        implementations = find_implementations(day, args.repeat)
+        if len(implementations) == 1:
+            print(f"{day.key}: no alternate implementations, skipping", file=sys.stderr)
+            continue
+
+        with tempfile.TemporaryDirectory(prefix="aoc-diff-") as directory:
+            input_path = day.input_path(args.input)
+            if args.generate is not None:
+                input_path = Path(directory) / "input.txt"
+                input_path.write_text(generators.generate(day.year, day.day, args.generate, args.seed))
+
+            with working_directory(day.directory):
+                run_implementations(implementations, str(input_path), args.timeout)
+
+        print(f"== {day.key} ==")
+        print(format_results(implementations))
+        mismatches |= any(
+            result.status == MISMATCH
+            for implementation in implementations
+            for result in implementation.results.values()
+        )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
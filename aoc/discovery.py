@@ -0,0 +1,179 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Discovery and loading of the per-day solutions.
+#
+# Two layouts exist in the repository:
+#   - `YYYY/N/solve.py`         the template layout with get_input/part1/part2
+#   - `2021/DayN/solution.py`   the legacy layout (and a few early 2022 days) which
+#                               read `input.txt` themselves and print the answers
+#
+# Template days are imported as modules and their functions are called directly.
+# Legacy days can only be executed as a whole script from inside their directory.
+# --------------------------------------------------------------------------------------
+
+import argparse
+import ast
+import importlib.util
+import os
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TEMPLATE_FUNCTIONS = ("get_input", "part1", "part2")
+
+DAY_DIR_PATTERN = re.compile(r"^(?:Day)?(\d+)$")
+TARGET_PATTERN = re.compile(r"^(\d+)(?:/(?:Day)?(\d+))?$")
+SOLUTION_FILES = ("solve.py", "solution.py")
+
+
+@dataclass(frozen=True)
+class Day:
+    year: int
+    day: int
+    path: Path
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day}"
+
+    @property
+    def directory(self) -> Path:
+        return self.path.parent
+
+    @property
+    def is_template(self) -> bool:
+        """
+        Checks (without importing) whether the solution follows the
+        get_input/part1/part2 contract of the templates.
+
+        Returns:
+            bool: True if all of the template functions are defined at the top level
+                and `get_input` takes the file name. Early 2022 days define the same
+                names, but open input.txt themselves and print the answers.
+        """
+        tree = ast.parse(self.path.read_text())
+        defined = {
+            node.name: node
+            for node in tree.body
+            if isinstance(node, ast.FunctionDef)
+        }
+        if not all(name in defined for name in TEMPLATE_FUNCTIONS):
+            return False
+        args = defined["get_input"].args
+        return bool(args.posonlyargs or args.args or args.vararg)
+
+    def input_path(self, filename: str = "input.txt") -> Path:
+        return self.directory / filename
+
+
+def discover(root: Path = REPO_ROOT, targets: list[str] | None = None) -> list[Day]:
+    """
+    Finds every Python solution in the repository.
+
+    Parameters:
+        root (Path): The repository root containing the year directories.
+        targets (list[str] | None): Optional filters in the form "YYYY" or "YYYY/N".
+
+    Returns:
+        list[Day]: The found days, sorted by year and day.
+
+    Raises:
+        ValueError: A target is malformed.
+    """
+    filters = [parse_target(target) for target in targets or ()]
+    days = []
+    for year_dir in root.iterdir():
+        if not (year_dir.is_dir() and year_dir.name.isdigit()):
+            continue
+
+        for day_dir in year_dir.iterdir():
+            match = DAY_DIR_PATTERN.match(day_dir.name)
+            if not (day_dir.is_dir() and match):
+                continue
+
+            for filename in SOLUTION_FILES:
+                path = day_dir / filename
+                if path.is_file():
+                    days.append(Day(int(year_dir.name), int(match.group(1)), path))
+                    break
+
+    days.sort(key=lambda d: (d.year, d.day))
+
+    if filters:
+        days = [day for day in days if matches(day, filters)]
+
+    return days
+
+
+def parse_target(target: str) -> tuple[int, int | None]:
+    """
+    Parses "YYYY" or "YYYY/N" (also "YYYY/DayN") into the year and the day (None for all).
+    """
+    match = TARGET_PATTERN.match(target.strip("/"))
+    if match is None:
+        raise ValueError(f'Invalid target "{target}", expected YYYY or YYYY/N')
+    year, day = match.groups()
+    return int(year), int(day) if day is not None else None
+
+
+def target_argument(target: str) -> str:
+    """
+    The argparse `type` of the target arguments, so malformed ones are reported as usage errors.
+    """
+    try:
+        parse_target(target)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return target
+
+
+def matches(day: Day, filters: list[tuple[int, int | None]]) -> bool:
+    return any(
+        year == day.year and (number is None or number == day.day)
+        for year, number in filters
+    )
+
+
+@contextmanager
+def working_directory(path: Path):
+    """
+    Temporarily changes the working directory, for the solutions which open
+    files relative to their own directory (e.g. 2015/21 `shop.txt`).
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def load_module(path: Path) -> ModuleType:
+    """
+    Imports the solution file as a standalone module. `main()` is not executed,
+    as the module is not loaded as `__main__`. The module is registered in
+    `sys.modules`, so that the classes it defines can be pickled.
+
+    Parameters:
+        path (Path): Path to the solution file.
+
+    Returns:
+        ModuleType: The imported module.
+    """
+    name = f"aoc_solution_{path.parent.parent.name}_{path.parent.name}_{path.stem}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
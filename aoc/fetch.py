@@ -0,0 +1,356 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Puzzle input fetching.
+#
+# `scripts/setup_day.sh` downloads a single input with curl when a day is set up, so
+# setting up a year is serial and repeats the downloads. This tool:
+#   - prefetches many days concurrently with asyncio, at most `--jobs` requests at once
+#     (the standard library has no async HTTP client, so every request is a blocking
+#     urllib call in a worker thread, bounded by a semaphore)
+#   - keeps every body in an on-disk cache (.cache/downloads/<year>/<day>.txt) with its
+#     ETag and SHA-256; a cached input whose hash matches is served without any request,
+#     `--revalidate` asks the server with If-None-Match, a corrupted one is downloaded again
+#   - writes input.txt into the day directories which already exist, but never replaces
+#     a different existing input.txt without `--force`
+#   - can be pointed at any server with `--base-url`, e.g. the local stub
+#     (`python -m aoc.fetch stub`), which serves the inputs of this repository with ETags;
+#     every other server has its own cache directory (.cache/downloads/servers/<server>),
+#     so its bodies are never served for the real inputs
+#
+# The session cookie is read from $AOC_COOKIE or ~/.secrets/aoc-cookie ("session=...")
+# and sent only to the default base URL.
+#
+# Usage: python -m aoc.fetch get 2025 [2016/1-5 ...] [--jobs 4] [--revalidate] [--offline] [--force]
+#        python -m aoc.fetch get 2025/3 --stdout
+#        python -m aoc.fetch stub [--port 8000]
+# --------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import hashlib
+import http.server
+import json
+import os
+import re
+import sys
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from aoc.discovery import REPO_ROOT
+
+
+BASE_URL = "https://adventofcode.com"
+DOWNLOAD_DIR = REPO_ROOT / ".cache" / "downloads"
+COOKIE_FILE = Path.home() / ".secrets" / "aoc-cookie"
+USER_AGENT = "github.com/garbaczdev/adventofcode by garbaczdev@gmail.com"
+
+TARGET_PATTERN = re.compile(r"^(\d{4})(?:/(\d+)(?:-(\d+))?)?$")
+INPUT_PATH_PATTERN = re.compile(r"^/(\d{4})/day/(\d+)/input$")
+UNSAFE_PATH_CHARACTERS = re.compile(r"[^\w.-]+")
+
+# Statuses of the fetched days
+CACHED = "cached"
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not-modified"
+FAILED = "failed"
+
+
+def days_in_year(year: int) -> int:
+    # Advent of Code has 12 days since 2025
+    return 12 if year >= 2025 else 25
+
+
+def parse_target(target: str) -> list[tuple[int, int]]:
+    """
+    Parses "2025" (the whole year), "2025/3" or "2016/1-5" into (year, day) pairs.
+    """
+    match = TARGET_PATTERN.match(target.strip("/"))
+    if match is None:
+        raise ValueError(f'Invalid target "{target}", expected YEAR, YEAR/DAY or YEAR/FIRST-LAST')
+    year, first, last = match.groups()
+    year = int(year)
+    if first is None:
+        return [(year, day) for day in range(1, days_in_year(year) + 1)]
+    return [(year, day) for day in range(int(first), int(last or first) + 1)]
+
+
+def cache_directory(base_url: str) -> Path:
+    """
+    The download cache of the server; only Advent of Code itself uses the main one.
+    """
+    base_url = base_url.rstrip("/")
+    if base_url == BASE_URL:
+        return DOWNLOAD_DIR
+    server = UNSAFE_PATH_CHARACTERS.sub("_", base_url.split("://", 1)[-1]).strip("_")
+    return DOWNLOAD_DIR / "servers" / server
+
+
+def read_cookie() -> str | None:
+    cookie = os.environ.get("AOC_COOKIE")
+    if cookie:
+        return cookie.strip()
+    try:
+        return COOKIE_FILE.read_text().strip() or None
+    except OSError:
+        return None
+
+
+@dataclass
+class CacheEntry:
+    body_path: Path
+    meta_path: Path
+
+    @classmethod
+    def of(cls, year: int, day: int, directory: Path = DOWNLOAD_DIR) -> "CacheEntry":
+        return cls(directory / str(year) / f"{day}.txt", directory / str(year) / f"{day}.json")
+
+    def load(self) -> tuple[bytes, dict] | None:
+        """
+        Returns the cached body and its metadata, None if missing or not matching its hash.
+        """
+        try:
+            body = self.body_path.read_bytes()
+            meta = json.loads(self.meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta.get("sha256"):
+            return None
+        return body, meta
+
+    def store(self, body: bytes, etag: str | None, url: str) -> None:
+        self.body_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "fetched": datetime.now().isoformat(timespec="seconds"),
+        }
+        # Written to temporary files first, so an interrupted run never leaves half a body
+        for path, data in ((self.body_path, body), (self.meta_path, json.dumps(meta, indent=2).encode())):
+            temporary = path.with_suffix(path.suffix + ".tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, path)
+
+
+@dataclass
+class FetchResult:
+    year: int
+    day: int
+    status: str
+    body: bytes | None = None
+    error: str | None = None
+
+
+def http_get(url: str, headers: dict[str, str], timeout: float) -> tuple[int, bytes, str | None]:
+    """
+    Blocking GET returning (status, body, ETag); 304 is a status, not an error.
+    """
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read(), response.headers.get("ETag")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, b"", e.headers.get("ETag")
+        raise
+
+
+async def fetch_day(
+    year: int,
+    day: int,
+    semaphore: asyncio.Semaphore,
+    base_url: str,
+    cookie: str | None,
+    revalidate: bool,
+    offline: bool,
+    timeout: float,
+) -> FetchResult:
+    entry = CacheEntry.of(year, day, cache_directory(base_url))
+    cached = entry.load()
+    if cached is not None and not revalidate:
+        return FetchResult(year, day, CACHED, cached[0])
+    if offline:
+        if cached is not None:
+            return FetchResult(year, day, CACHED, cached[0])
+        return FetchResult(year, day, FAILED, error="not cached")
+
+    url = f"{base_url.rstrip('/')}/{year}/day/{day}/input"
+    headers = {"User-Agent": USER_AGENT, "Referer": f"{base_url.rstrip('/')}/{year}/day/{day}"}
+    if cookie:
+        headers["Cookie"] = cookie
+    if cached is not None and cached[1].get("etag"):
+        headers["If-None-Match"] = cached[1]["etag"]
+
+    async with semaphore:
+        try:
+            status, body, etag = await asyncio.to_thread(http_get, url, headers, timeout)
+        except (urllib.error.URLError, OSError) as e:
+            if cached is not None:
+                # Offline-friendly: the cached body is still valid
+                return FetchResult(year, day, CACHED, cached[0], error=str(e))
+            return FetchResult(year, day, FAILED, error=str(e))
+
+    if status == 304 and cached is not None:
+        return FetchResult(year, day, NOT_MODIFIED, cached[0])
+
+    entry.store(body, etag, url)
+    return FetchResult(year, day, DOWNLOADED, body)
+
+
+async def fetch_all(
+    days: list[tuple[int, int]],
+    jobs: int = 4,
+    base_url: str = BASE_URL,
+    cookie: str | None = None,
+    revalidate: bool = False,
+    offline: bool = False,
+    timeout: float = 30,
+) -> list[FetchResult]:
+    """
+    Fetches the inputs of all days concurrently.
+
+    Parameters:
+        days (list[tuple[int, int]]): The (year, day) pairs.
+        jobs (int): The maximal number of requests in flight.
+        base_url (str): The server, e.g. "http://localhost:8000" for the stub.
+        cookie (str | None): The session cookie header value.
+        revalidate (bool): Ask the server about cached inputs too (If-None-Match).
+        offline (bool): Never make a request, serve the cache only.
+        timeout (float): The timeout of a single request in seconds.
+
+    Returns:
+        list[FetchResult]: The results in the order of the days.
+    """
+    semaphore = asyncio.Semaphore(jobs)
+    return await asyncio.gather(*(
+        fetch_day(year, day, semaphore, base_url, cookie, revalidate, offline, timeout)
+        for year, day in days
+    ))
+
+
+def write_input(result: FetchResult, root: Path = REPO_ROOT, force: bool = False) -> str:
+    """
+    Writes the body as input.txt of the day directory, if the directory exists.
+    An existing, different input.txt is only replaced with `force`.
+
+    Returns:
+        str: A note about what happened to input.txt, empty if nothing was written.
+    """
+    directory = root / str(result.year) / str(result.day)
+    if result.body is None or not directory.is_dir():
+        return ""
+    path = directory / "input.txt"
+    if path.is_file():
+        if path.read_bytes() == result.body:
+            return ""
+        if not force:
+            return "input.txt differs, kept (--force replaces it)"
+    path.write_bytes(result.body)
+    return "written to input.txt"
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves /<year>/day/<day>/input from the input.txt files of this repository,
+    with a content hash ETag and If-None-Match support.
+    """
+
+    def do_GET(self) -> None:
+        match = INPUT_PATH_PATTERN.match(self.path)
+        path = REPO_ROOT / match.group(1) / str(int(match.group(2))) / "input.txt" if match else None
+        if path is None or not path.is_file():
+            self.send_error(404)
+            return
+
+        body = path.read_bytes()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_stub(port: int) -> None:
+    with http.server.ThreadingHTTPServer(("127.0.0.1", port), StubHandler) as server:
+        print(f"Serving the repository inputs on http://127.0.0.1:{port}", file=sys.stderr)
+        server.serve_forever()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.fetch", description="Fetch and cache the puzzle inputs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = subparsers.add_parser("get", help="fetch the inputs of the given days")
+    fetch_parser.add_argument("targets", nargs="+", help='days to fetch, e.g. "2025", "2025/3" or "2016/1-5"')
+    fetch_parser.add_argument("-j", "--jobs", type=int, default=4, help="maximal number of concurrent requests")
+    fetch_parser.add_argument("--base-url", default=os.environ.get("AOC_BASE_URL", BASE_URL), help="the server to fetch from")
+    fetch_parser.add_argument("--revalidate", action="store_true", help="check the cached inputs with the server (ETag)")
+    fetch_parser.add_argument("--offline", action="store_true", help="serve from the cache only")
+    fetch_parser.add_argument("--timeout", type=float, default=30, help="timeout of a single request in seconds")
+    fetch_parser.add_argument("--stdout", action="store_true", help="print the inputs instead of writing the day directories")
+    fetch_parser.add_argument("--force", action="store_true", help="replace existing input.txt files which differ")
+
+    stub_parser = subparsers.add_parser("stub", help="serve the inputs of this repository locally")
+    stub_parser.add_argument("--port", type=int, default=8000, help="the port to listen on")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+
+    if args.command == "stub":
+        serve_stub(args.port)
+        return
+
+    try:
+        days = [day for target in args.targets for day in parse_target(target)]
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+
+    # The session cookie is never sent anywhere else than to Advent of Code itself
+    cookie = read_cookie() if args.base_url == BASE_URL else None
+    if cookie is None and args.base_url == BASE_URL and not args.offline:
+        print(f"No session cookie, set $AOC_COOKIE or write it to {COOKIE_FILE}", file=sys.stderr)
+
+    results = asyncio.run(fetch_all(
+        days,
+        jobs=args.jobs,
+        base_url=args.base_url,
+        cookie=cookie,
+        revalidate=args.revalidate,
+        offline=args.offline,
+        timeout=args.timeout,
+    ))
+
+    for result in results:
+        if args.stdout:
+            if result.body is not None:
+                sys.stdout.buffer.write(result.body)
+        else:
+            written = write_input(result, force=args.force)
+            note = result.error or written
+            print(f"{result.year}/{result.day:<3} {result.status:<12} {note}".rstrip(), file=sys.stderr)
+
+    if any(result.status == FAILED for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Synthetic input generators.
+#
+# Every module `yYYYY_dN.py` generates valid puzzle inputs for a single day:
+#
+#   def generate(scale: float, rng: random.Random) -> str
+#
+# `scale` multiplies the size of the real puzzle input (scale=1 is roughly the size
+# of the real one), the returned string is the content of the input file.
+# --------------------------------------------------------------------------------------
+
+import importlib
+import pkgutil
+import random
+from types import ModuleType
+
+
+def module_name(year: int, day: int) -> str:
+    return f"y{year}_d{day}"
+
+
+def get_generator(year: int, day: int) -> ModuleType | None:
+    """
+    Returns the generator module of the given day, None if there is none.
+    """
+    name = module_name(year, day)
+    if name not in available():
+        return None
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def available() -> list[str]:
+    return [module.name for module in pkgutil.iter_modules(__path__)]
+
+
+def generate(year: int, day: int, scale: float, seed: int = 0) -> str:
+    """
+    Generates an input for the given day.
+
+    Parameters:
+        year (int): The puzzle year.
+        day (int): The puzzle day.
+        scale (float): The size relative to the real puzzle input.
+        seed (int): The random seed, the same seed always produces the same input.
+
+    Returns:
+        str: The content of the input file.
+    """
+    generator = get_generator(year, day)
+    if generator is None:
+        raise ValueError(f"No input generator for {year}/{day}")
+    return generator.generate(scale, random.Random(seed))
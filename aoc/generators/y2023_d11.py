@@ -0,0 +1,37 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# 2023 Day 11: Cosmic Expansion
+#
+# A square map of galaxies ('#') with a few fully empty rows and columns. The number
+# of galaxies grows linearly with the scale, so the pair count grows quadratically.
+# --------------------------------------------------------------------------------------
+
+import random
+from math import sqrt
+
+
+BASE_SIDE = 140
+GALAXY_DENSITY = 0.022
+EMPTY_LINE_RATIO = 0.06
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    side = max(2, round(BASE_SIDE * sqrt(scale)))
+
+    empty_rows = set(rng.sample(range(side), int(side * EMPTY_LINE_RATIO)))
+    empty_cols = set(rng.sample(range(side), int(side * EMPTY_LINE_RATIO)))
+
+    return "\n".join(
+        "".join(
+            "#"
+            if y not in empty_rows and x not in empty_cols and rng.random() < GALAXY_DENSITY
+            else "."
+            for x in range(side)
+        )
+        for y in range(side)
+    ) + "\n"
@@ -0,0 +1,34 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# 2025 Day 5: Cafeteria
+#
+# Overlapping "start-end" ingredient id ranges, an empty line and the ingredient ids
+# to check. Both the number of ranges and of ids grow linearly with the scale.
+# --------------------------------------------------------------------------------------
+
+import random
+
+
+BASE_RANGES = 180
+BASE_IDS = 1000
+MAX_ID = 560_000_000_000_000
+MAX_RANGE_LENGTH = 5_000_000_000_000
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    ranges = []
+    for _ in range(max(1, round(BASE_RANGES * scale))):
+        start = rng.randrange(1, MAX_ID)
+        ranges.append(f"{start}-{start + rng.randrange(MAX_RANGE_LENGTH)}")
+
+    ids = [
+        str(rng.randrange(1, MAX_ID))
+        for _ in range(max(1, round(BASE_IDS * scale)))
+    ]
+
+    return "\n".join(ranges) + "\n\n" + "\n".join(ids) + "\n"
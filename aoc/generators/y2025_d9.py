@@ -0,0 +1,47 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# 2025 Day 9: Movie Theater
+#
+# A closed loop of red tiles where every two consecutive tiles share a row or a column.
+# The tiles are placed around a circle with a jittered radius, joined by an extra
+# corner tile between every two of them, the same shape as the real inputs.
+# --------------------------------------------------------------------------------------
+
+import random
+from math import cos, pi, sin
+
+
+BASE_TILES = 496
+CENTER = 50_000
+RADIUS = 48_000
+RADIUS_JITTER = 0.02
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    count = max(4, round(BASE_TILES * scale / 2))
+
+    points = []
+    for i in range(count):
+        angle = 2 * pi * i / count
+        radius = RADIUS * (1 - rng.random() * RADIUS_JITTER)
+        points.append((round(CENTER + radius * cos(angle)), round(CENTER + radius * sin(angle))))
+
+    tiles = []
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        tiles.append((x1, y1))
+        # The corner turning from the current tile to the next one
+        tiles.append((x2, y1))
+
+    # Drop the repeated tiles of degenerate corners
+    unique_tiles = [
+        tile
+        for i, tile in enumerate(tiles)
+        if tile != tiles[i - 1]
+    ]
+
+    return "\n".join(f"{x},{y}" for x, y in unique_tiles) + "\n"
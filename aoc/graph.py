@@ -0,0 +1,306 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Graph searches.
+#
+# The hand-rolled searches keep their queues in lists: 2021/15 inserts into a sorted
+# list, 2022/12, 2023/10 and 2025/8 `pop(0)`, all O(n) per operation. This module
+# implements them once with the proper queues:
+#   - `bfs` (multi-source) with a `collections.deque`
+#   - `dijkstra` with a `heapq` binary heap
+#   - `dial`, Dijkstra with a bucket queue, O(1) per operation for small integer weights
+#   - `astar` with a pluggable heuristic (`manhattan`, `chebyshev`)
+#
+# A graph is any function returning the (neighbour, weight) pairs of a node:
+# `adjacency` wraps a dict and `grid_graph` a NumPy grid with (x, y) nodes.
+# The target of a search is a node or a predicate, e.g. "any cell of height a".
+#
+# Usage:
+#   from aoc.graph import dijkstra, grid_graph
+#
+#   risk = dijkstra(grid_graph(costs=risk_levels), [(0, 0)], target=(width - 1, height - 1))
+#   print(risk.distances[risk.reached], risk.path(risk.reached))
+# --------------------------------------------------------------------------------------
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+
+
+Node = Hashable
+Graph = Callable[[Node], Iterable[tuple[Node, int | float]]]
+
+DIRECTIONS_4 = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+DIRECTIONS_8 = [
+    (x, y)
+    for x in range(-1, 2)
+    for y in range(-1, 2)
+    if x != 0 or y != 0
+]
+
+
+@dataclass
+class Search:
+    # The distance of every settled node from the nearest source
+    distances: dict[Node, int | float] = field(default_factory=dict)
+    # The predecessor of every reached node, None for the sources
+    parents: dict[Node, Node | None] = field(default_factory=dict)
+    # The target the search stopped at, None if it was not reached (or not given)
+    reached: Node | None = None
+
+    def path(self, node: Node) -> list[Node]:
+        """
+        Returns the path from its source to the node, both included.
+        """
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+
+def adjacency(edges: dict) -> Graph:
+    """
+    Wraps an adjacency dict. The values are either iterables of neighbours (weight 1)
+    or dicts mapping the neighbours to their weights.
+    """
+    def neighbours(node: Node):
+        adjacent = edges.get(node, ())
+        if isinstance(adjacent, dict):
+            return adjacent.items()
+        return ((neighbour, 1) for neighbour in adjacent)
+
+    return neighbours
+
+
+def grid_graph(
+    passable: np.ndarray | None = None,
+    costs: np.ndarray | None = None,
+    diagonal: bool = False,
+    can_step: Callable[[tuple[int, int], tuple[int, int]], bool] | None = None,
+) -> Graph:
+    """
+    Creates the graph of a NumPy grid with (x, y) nodes.
+
+    Parameters:
+        passable (np.ndarray | None): The boolean mask of the cells which can be entered.
+        costs (np.ndarray | None): The cost of entering every cell (e.g. the 2021/15 risk levels), 1 by default.
+        diagonal (bool): Allow diagonal steps.
+        can_step (callable | None): Additional rule for a step from one cell to another,
+            e.g. the 2022/12 "at most one higher" climbing rule.
+
+    Returns:
+        Graph: The neighbours function.
+    """
+    shape = (passable if passable is not None else costs).shape
+    height, width = shape
+    # Python lists are much faster to index element by element than arrays
+    passable_rows = passable.astype(bool).tolist() if passable is not None else None
+    cost_rows = costs.tolist() if costs is not None else None
+    directions = DIRECTIONS_8 if diagonal else DIRECTIONS_4
+
+    def neighbours(node: tuple[int, int]):
+        x, y = node
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            if passable_rows is not None and not passable_rows[ny][nx]:
+                continue
+            if can_step is not None and not can_step(node, (nx, ny)):
+                continue
+            yield (nx, ny), (cost_rows[ny][nx] if cost_rows is not None else 1)
+
+    return neighbours
+
+
+def matcher(target: Node | Callable[[Node], bool] | None) -> Callable[[Node], bool]:
+    if target is None:
+        return lambda node: False
+    if callable(target):
+        return target
+    return lambda node: node == target
+
+
+def bfs(graph: Graph, sources: Iterable[Node], target: Node | Callable[[Node], bool] | None = None) -> Search:
+    """
+    Breadth-first search from all of the sources at once; the weights are ignored.
+
+    Parameters:
+        graph (Graph): The neighbours function.
+        sources (Iterable[Node]): The start nodes, all at distance 0.
+        target (Node | callable | None): Stop at the first node equal to (or matching) the target.
+
+    Returns:
+        Search: The distances in steps and the parents of the reached nodes.
+    """
+    is_target = matcher(target)
+    search = Search()
+    queue = deque()
+    for source in sources:
+        if source not in search.distances:
+            search.distances[source] = 0
+            search.parents[source] = None
+            queue.append(source)
+
+    while queue:
+        node = queue.popleft()
+        if is_target(node):
+            search.reached = node
+            break
+        distance = search.distances[node] + 1
+        for neighbour, _ in graph(node):
+            if neighbour not in search.distances:
+                search.distances[neighbour] = distance
+                search.parents[neighbour] = node
+                queue.append(neighbour)
+
+    return search
+
+
+def dijkstra(graph: Graph, sources: Iterable[Node], target: Node | Callable[[Node], bool] | None = None) -> Search:
+    """
+    Dijkstra's shortest paths with a binary heap and lazy deletion of the outdated entries.
+    The weights must be non-negative.
+
+    Parameters:
+        graph (Graph): The neighbours function.
+        sources (Iterable[Node]): The start nodes, all at distance 0.
+        target (Node | callable | None): Stop once the target is settled.
+
+    Returns:
+        Search: The distances of the settled nodes and their parents.
+    """
+    return astar(graph, sources, target, lambda node: 0)
+
+
+def astar(
+    graph: Graph,
+    sources: Iterable[Node],
+    target: Node | Callable[[Node], bool],
+    heuristic: Callable[[Node], int | float],
+) -> Search:
+    """
+    A* search. With an admissible heuristic (never overestimating the remaining
+    distance) the distance of the target is optimal; with `lambda node: 0` it is Dijkstra.
+
+    Parameters:
+        graph (Graph): The neighbours function.
+        sources (Iterable[Node]): The start nodes.
+        target (Node | callable): The node (or predicate) to find.
+        heuristic (callable): The estimated distance from a node to the target,
+            e.g. `lambda node: manhattan(node, end)`.
+
+    Returns:
+        Search: The search state when the target was settled.
+    """
+    is_target = matcher(target)
+    search = Search()
+    best = {}
+    # The counter breaks the ties, so the nodes themselves are never compared
+    order = count()
+    heap = []
+    for source in sources:
+        best[source] = 0
+        search.parents[source] = None
+        heapq.heappush(heap, (heuristic(source), next(order), 0, source))
+
+    while heap:
+        _, _, distance, node = heapq.heappop(heap)
+        if node in search.distances:
+            continue
+        search.distances[node] = distance
+        if is_target(node):
+            search.reached = node
+            break
+
+        for neighbour, weight in graph(node):
+            new_distance = distance + weight
+            if neighbour not in search.distances and new_distance < best.get(neighbour, new_distance + 1):
+                best[neighbour] = new_distance
+                search.parents[neighbour] = node
+                heapq.heappush(heap, (new_distance + heuristic(neighbour), next(order), new_distance, neighbour))
+
+    # Reached but never settled nodes are not part of the result
+    search.parents = {node: parent for node, parent in search.parents.items() if node in search.distances}
+    return search
+
+
+def dial(
+    graph: Graph,
+    sources: Iterable[Node],
+    target: Node | Callable[[Node], bool] | None = None,
+    max_weight: int = 9,
+) -> Search:
+    """
+    Dijkstra with a bucket queue (Dial's algorithm) for integer weights in [0, max_weight].
+    Only max_weight + 1 buckets are needed, as no queued distance exceeds the current
+    one by more than max_weight, so they are reused cyclically.
+
+    Parameters:
+        graph (Graph): The neighbours function with small non-negative integer weights.
+        sources (Iterable[Node]): The start nodes, all at distance 0.
+        target (Node | callable | None): Stop once the target is settled.
+        max_weight (int): The largest edge weight, e.g. 9 for the 2021/15 risk levels.
+
+    Returns:
+        Search: The distances of the settled nodes and their parents.
+
+    Raises:
+        ValueError: An edge weight is negative or larger than max_weight.
+    """
+    is_target = matcher(target)
+    search = Search()
+    best = {}
+    buckets = [[] for _ in range(max_weight + 1)]
+    queued = 0
+    for source in sources:
+        best[source] = 0
+        search.parents[source] = None
+        buckets[0].append(source)
+        queued += 1
+
+    distance = 0
+    while queued:
+        bucket = buckets[distance % len(buckets)]
+        while bucket:
+            node = bucket.pop()
+            queued -= 1
+            if node in search.distances or best[node] != distance:
+                continue
+            search.distances[node] = distance
+            if is_target(node):
+                search.reached = node
+                search.parents = {n: p for n, p in search.parents.items() if n in search.distances}
+                return search
+
+            for neighbour, weight in graph(node):
+                # A heavier edge would land in the bucket being drained and never settle
+                if not 0 <= weight <= max_weight:
+                    raise ValueError(f"Edge weight {weight} outside of [0, {max_weight}]")
+                new_distance = distance + weight
+                if neighbour not in search.distances and new_distance < best.get(neighbour, new_distance + 1):
+                    best[neighbour] = new_distance
+                    search.parents[neighbour] = node
+                    buckets[new_distance % len(buckets)].append(neighbour)
+                    queued += 1
+        distance += 1
+
+    return search
+
+
+def manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def chebyshev(a: tuple[int, int], b: tuple[int, int]) -> int:
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
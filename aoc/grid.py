@@ -0,0 +1,237 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Character map toolkit.
+#
+# The grid days repeat the same per-cell Python loops: bounds checks (`get_element` in
+# 2025/4, `is_in_bounds` in 2015/18 and 2023/14), 8-neighbour loops
+# (`get_adjacent_cords`) and try/except IndexError (2021/9, 2021/11). Here a map is a
+# 2D `np.uint8` array of character codes, optionally padded with a border of filler
+# cells, so that neighbour lookups never leave the array, and every operation works
+# on the whole array at once:
+#   - `load`, `from_lines`, `pad`, `interior` to build and unwrap the grids
+#   - `mask`, `find` to select cells by character
+#   - `shifted`, `neighbours`, `neighbour_count`, `dilate` for neighbourhood rules
+#   - `distance_field`, `flood_fill` for breadth-first searches
+#
+# Coordinates are (x, y) tuples like in the solutions; arrays are indexed [y, x].
+#
+# Usage:
+#   from aoc import grid
+#
+#   rolls = grid.mask(grid.load("input.txt"), "@")
+#   accessible = rolls & (grid.neighbour_count(rolls) < 4)
+# --------------------------------------------------------------------------------------
+
+from typing import Iterable
+
+import numpy as np
+
+from aoc.loader import char_grid
+
+
+DIRECTIONS_4 = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+DIRECTIONS_8 = [
+    (x, y)
+    for x in range(-1, 2)
+    for y in range(-1, 2)
+    if x != 0 or y != 0
+]
+
+
+def codes(chars: str | Iterable[str]) -> list[int]:
+    return [ord(char) for char in chars]
+
+
+def pad(grid: np.ndarray, width: int = 1, fill: str | int | bool = ".") -> np.ndarray:
+    """
+    Surrounds the grid with a border of filler cells, returning a new array.
+
+    Parameters:
+        grid (np.ndarray): A character grid or a mask.
+        width (int): The border width.
+        fill (str | int | bool): The filler, a character for character grids.
+
+    Returns:
+        np.ndarray: The padded grid of shape (height + 2 * width, width + 2 * width).
+    """
+    value = ord(fill) if isinstance(fill, str) else fill
+    return np.pad(grid, width, constant_values=value)
+
+
+def interior(grid: np.ndarray, width: int = 1) -> np.ndarray:
+    """
+    Returns the view of a padded grid without its border.
+    """
+    return grid[width:grid.shape[0] - width, width:grid.shape[1] - width]
+
+
+def load(filename: str, padding: int = 0, fill: str = ".") -> np.ndarray:
+    """
+    Loads a rectangular character map as a 2D `np.uint8` array of character codes.
+
+    Parameters:
+        filename (str): The input file.
+        padding (int): The width of the border of `fill` cells around the map.
+        fill (str): The character of the border.
+
+    Returns:
+        np.ndarray: A writable grid, independent of the file.
+    """
+    grid = char_grid(filename)
+    if padding:
+        return pad(grid, padding, fill)
+    return np.array(grid)
+
+
+def from_lines(lines: list[str], padding: int = 0, fill: str = ".") -> np.ndarray:
+    """
+    Builds the character grid from lines of the same width, e.g. an already read input.
+    """
+    grid = np.array([list(line.encode()) for line in lines], dtype=np.uint8).reshape(len(lines), -1)
+    if padding:
+        return pad(grid, padding, fill)
+    return grid
+
+
+def to_lines(grid: np.ndarray) -> list[str]:
+    return [row.tobytes().decode() for row in np.ascontiguousarray(grid, dtype=np.uint8)]
+
+
+def mask(grid: np.ndarray, chars: str | Iterable[str]) -> np.ndarray:
+    """
+    Returns the boolean mask of the cells holding any of the given characters.
+    """
+    values = codes(chars)
+    if len(values) == 1:
+        return grid == values[0]
+    return np.isin(grid, values)
+
+
+def find(grid: np.ndarray, char: str) -> list[tuple[int, int]]:
+    """
+    Returns the (x, y) coordinates of all cells holding the character, row by row.
+    """
+    ys, xs = np.nonzero(grid == ord(char))
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def shifted(grid: np.ndarray, dx: int, dy: int, fill: int | bool = 0) -> np.ndarray:
+    """
+    Returns the grid in which every cell holds the value of its neighbour at (x + dx, y + dy),
+    with `fill` for the neighbours outside of the grid.
+
+    Parameters:
+        grid (np.ndarray): A 2D array.
+        dx (int): The column offset of the neighbour.
+        dy (int): The row offset of the neighbour.
+        fill (int | bool): The value of the cells outside of the grid.
+
+    Returns:
+        np.ndarray: A new array of the same shape and dtype.
+    """
+    height, width = grid.shape
+    result = np.full_like(grid, fill)
+    if abs(dx) >= width or abs(dy) >= height:
+        return result
+
+    result[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+        grid[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+    return result
+
+
+def neighbours(padded: np.ndarray, dx: int, dy: int, padding: int = 1) -> np.ndarray:
+    """
+    Zero-copy version of `shifted` for padded grids: the view of the neighbours at
+    (x + dx, y + dy) of every interior cell. The offsets must not exceed the padding.
+
+    Returns:
+        np.ndarray: A view of the shape of the interior.
+    """
+    height, width = padded.shape
+    return padded[padding + dy:height - padding + dy, padding + dx:width - padding + dx]
+
+
+def neighbour_count(cells: np.ndarray, diagonal: bool = True) -> np.ndarray:
+    """
+    Counts for every cell how many of its neighbours are set in the mask,
+    e.g. the 2015/18 lights or the 2025/4 paper rolls.
+
+    Parameters:
+        cells (np.ndarray): A boolean mask.
+        diagonal (bool): Count the 8 neighbours instead of the 4 orthogonal ones.
+
+    Returns:
+        np.ndarray: The `np.uint8` counts, of the same shape as the mask.
+    """
+    padded = pad(cells.astype(np.uint8), 1, 0)
+    counts = np.zeros(cells.shape, dtype=np.uint8)
+    for dx, dy in DIRECTIONS_8 if diagonal else DIRECTIONS_4:
+        counts += neighbours(padded, dx, dy)
+    return counts
+
+
+def dilate(cells: np.ndarray, diagonal: bool = False) -> np.ndarray:
+    """
+    Returns the mask grown by one step: the cells which are set or have a set neighbour.
+    """
+    padded = pad(cells.astype(bool), 1, False)
+    result = cells.astype(bool)
+    for dx, dy in DIRECTIONS_8 if diagonal else DIRECTIONS_4:
+        result |= neighbours(padded, dx, dy)
+    return result
+
+
+def distance_field(
+    passable: np.ndarray,
+    sources: np.ndarray | Iterable[tuple[int, int]],
+    diagonal: bool = False,
+    max_distance: int | None = None,
+) -> np.ndarray:
+    """
+    Computes the number of steps from the nearest source to every cell, moving only
+    through passable cells. The search expands the whole frontier at once with array
+    operations, so it costs O(cells) NumPy work per distance level: ideal for open maps,
+    while a long single-file maze is better served by a deque BFS.
+
+    Parameters:
+        passable (np.ndarray): The boolean mask of the cells which can be entered.
+        sources (np.ndarray | Iterable[tuple[int, int]]): A boolean mask or the (x, y) starts.
+        diagonal (bool): Allow diagonal steps.
+        max_distance (int | None): Stop expanding after this many steps.
+
+    Returns:
+        np.ndarray: The `np.int32` distances, -1 for the unreachable cells.
+    """
+    passable = passable.astype(bool)
+    if isinstance(sources, np.ndarray):
+        frontier = sources.astype(bool) & passable
+    else:
+        frontier = np.zeros(passable.shape, dtype=bool)
+        for x, y in sources:
+            frontier[y, x] = passable[y, x]
+
+    distances = np.full(passable.shape, -1, dtype=np.int32)
+    distances[frontier] = 0
+    visited = frontier.copy()
+
+    distance = 0
+    while frontier.any() and (max_distance is None or distance < max_distance):
+        distance += 1
+        frontier = dilate(frontier, diagonal) & passable & ~visited
+        distances[frontier] = distance
+        visited |= frontier
+
+    return distances
+
+
+def flood_fill(passable: np.ndarray, start: tuple[int, int], diagonal: bool = False) -> np.ndarray:
+    """
+    Returns the boolean mask of the region reachable from the (x, y) start,
+    e.g. the 2021/9 basins (passable = heights below 9).
+    """
+    return distance_field(passable, [start], diagonal) >= 0
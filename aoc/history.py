@@ -0,0 +1,244 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Benchmark history and regression detection.
+#
+# Results of `python -m aoc.bench --save` are appended to a JSONL file, one record per
+# year/day/part, keyed by the git commit and the hash of the input file. The compare
+# command matches the records of two commits and flags every part whose median
+# got slower by more than the threshold.
+#
+# Usage: python -m aoc.history compare [--base COMMIT] [--head COMMIT] [--threshold 0.1]
+#        python -m aoc.history list
+# --------------------------------------------------------------------------------------
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+
+from aoc.discovery import REPO_ROOT
+
+
+HISTORY_FILE = REPO_ROOT / ".bench" / "history.jsonl"
+
+
+@dataclass
+class Comparison:
+    key: str
+    base_ns: float
+    head_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head_ns / self.base_ns if self.base_ns else float("inf")
+
+
+def git_commit() -> str:
+    """
+    Returns the current commit hash, suffixed with "-dirty" if the tree has
+    uncommitted changes, or "unknown" outside of a git checkout.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "diff", "--quiet", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True,
+        ).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return sha256(f.read()).hexdigest()[:16]
+
+
+def append(timings: list, days: list, input_name: str, path: Path = HISTORY_FILE) -> int:
+    """
+    Appends the successful timings of a benchmark run to the history file.
+
+    Parameters:
+        timings (list[Timing]): The results of `aoc.bench.run_day`.
+        days (list[Day]): The benchmarked days, used to hash their input files.
+        input_name (str): The input file name the benchmark was run with.
+        path (Path): The history file.
+
+    Returns:
+        int: The number of appended records.
+    """
+    commit = git_commit()
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    input_hashes = {
+        (day.year, day.day): file_hash(day.input_path(input_name))
+        for day in days
+        if day.input_path(input_name).is_file()
+    }
+
+    records = [
+        {
+            "timestamp": timestamp,
+            "commit": commit,
+            "year": timing.year,
+            "day": timing.day,
+            "part": timing.part,
+            "input": input_name,
+            "input_hash": input_hashes[(timing.year, timing.day)],
+            "repeat": len(timing.samples),
+            "min_ns": timing.min_ns,
+            "median_ns": timing.median_ns,
+            "p95_ns": timing.p95_ns,
+        }
+        # Failed and skipped parts have no samples
+        for timing in timings
+        if timing.samples
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+    return len(records)
+
+
+def load(path: Path = HISTORY_FILE) -> list[dict]:
+    if not path.is_file():
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def commits(records: list[dict]) -> list[str]:
+    """
+    Returns the distinct commits in the order they were first recorded.
+    """
+    return list(dict.fromkeys(record["commit"] for record in records))
+
+
+def latest_medians(records: list[dict], commit: str) -> dict[str, float]:
+    """
+    Maps "year/day/part@input_hash" to the most recently recorded median of the commit.
+    Keying by the input hash makes sure that runs on different inputs are never compared.
+    """
+    return {
+        f"{r['year']}/{r['day']}/{r['part']}@{r['input_hash']}": r["median_ns"]
+        for r in records
+        if r["commit"] == commit
+    }
+
+
+def expected_durations(records: list[dict]) -> dict[tuple[int, int], float]:
+    """
+    Estimates how long a single run of every day takes, as the sum of the most
+    recently recorded medians of its parts (on any commit and input).
+
+    Returns:
+        dict[tuple[int, int], float]: (year, day) mapped to the estimate in nanoseconds.
+    """
+    latest = {
+        (r["year"], r["day"], r["part"]): r["median_ns"]
+        for r in records
+    }
+    durations = {}
+    for (year, day, _), median_ns in latest.items():
+        durations[(year, day)] = durations.get((year, day), 0) + median_ns
+    return durations
+
+
+def compare(records: list[dict], base: str, head: str) -> list[Comparison]:
+    base_medians = latest_medians(records, base)
+    head_medians = latest_medians(records, head)
+    return [
+        Comparison(key.split("@")[0], base_medians[key], head_ns)
+        for key, head_ns in head_medians.items()
+        if key in base_medians
+    ]
+
+
+def resolve_commits(records: list[dict], base: str | None, head: str | None) -> tuple[str, str]:
+    """
+    Defaults the head to the commit of the most recent run and the base to the most
+    recently run other commit, so re-running an older commit makes it the head.
+    """
+    known = commits(records)
+    head = head or records[-1]["commit"]
+    if base is None:
+        base = next((record["commit"] for record in reversed(records) if record["commit"] != head), None)
+        if base is None:
+            raise ValueError("The history contains only one commit, nothing to compare")
+    for commit in (base, head):
+        if commit not in known:
+            raise ValueError(f"No benchmark records for commit {commit}")
+    return base, head
+
+
+def print_comparisons(comparisons: list[Comparison], threshold: float) -> list[Comparison]:
+    regressions = []
+    for comparison in sorted(comparisons, key=lambda c: c.ratio, reverse=True):
+        regressed = comparison.ratio > 1 + threshold
+        if regressed:
+            regressions.append(comparison)
+        print(
+            f"{'REGRESSION' if regressed else 'ok':<10}  {comparison.key:<16}"
+            f"  {comparison.base_ns / 1e6:>12.3f} ms -> {comparison.head_ns / 1e6:>12.3f} ms"
+            f"  ({comparison.ratio:.2f}x)"
+        )
+    return regressions
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.history", description="Inspect the benchmark history.")
+    parser.add_argument("--file", type=Path, default=HISTORY_FILE, help="the history file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = subparsers.add_parser("compare", help="compare the medians of two commits")
+    compare_parser.add_argument("--base", help="the reference commit (default: the previously recorded one)")
+    compare_parser.add_argument("--head", help="the compared commit (default: the last recorded one)")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown (0.1 = 10%%)")
+
+    subparsers.add_parser("list", help="list the recorded commits")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    records = load(args.file)
+
+    if not records:
+        print(f"No benchmark history in {args.file}")
+        sys.exit(1)
+
+    if args.command == "list":
+        for commit in commits(records):
+            count = sum(record["commit"] == commit for record in records)
+            print(f"{commit}  ({count} records)")
+        return
+
+    try:
+        base, head = resolve_commits(records, args.base, args.head)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"Comparing {base} -> {head} (threshold {args.threshold:.0%})")
+    regressions = print_comparisons(compare(records, base, head), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} part(s) regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
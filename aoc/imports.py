@@ -0,0 +1,180 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Import cost of the solutions.
+#
+# Several days import NumPy at the top level only for containers (2021/13, 2023/14,
+# 2025/4, ...), so even their trivial parts pay tens of milliseconds before the first line runs.
+#
+#   - `lazy` runs a solution with the heavy modules (HEAVY_MODULES) imported lazily:
+#     `import numpy as np` only creates a placeholder and NumPy is loaded on the first
+#     attribute access, so parts which never touch it never pay for it.
+#   - `report` measures the import cost of every day in a fresh interpreter with
+#     `-X importtime`, counting only the modules imported by the solution itself.
+#     The same measurement is available in the runner as `bench --import-time`.
+#
+# Usage: python -m aoc.imports lazy 2023/14/solve.py 2023/14/input.txt
+#        python -m aoc.imports report [year | year/day ...]
+# --------------------------------------------------------------------------------------
+
+import argparse
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import runpy
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from aoc.discovery import Day, discover, target_argument
+
+
+HEAVY_MODULES = ("numpy",)
+
+# Loads the solution without running main(); importlib.util is used directly, so that
+# no module of this package is imported before the solution
+IMPORT_SCRIPT = """
+import sys
+import importlib.util
+spec = importlib.util.spec_from_file_location("solution", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+print("--- solution ---", file=sys.stderr, flush=True)
+spec.loader.exec_module(module)
+"""
+
+
+class LazyFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder wrapping the loaders of the given top-level modules in
+    `importlib.util.LazyLoader`, which defers executing a module until its first
+    attribute access. `from numpy import x` still loads the module immediately.
+    """
+
+    def __init__(self, names: tuple[str, ...] = HEAVY_MODULES) -> None:
+        self.names = set(names)
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.names:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or spec.loader is None:
+            return None
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        return spec
+
+
+def enable_lazy_imports(names: tuple[str, ...] = HEAVY_MODULES) -> LazyFinder:
+    finder = LazyFinder(names)
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def run_lazy(path: Path, args: list[str]) -> None:
+    """
+    Runs the solution script as `__main__` with the heavy modules imported lazily.
+
+    Parameters:
+        path (Path): The solution file.
+        args (list[str]): The command-line arguments of the script (e.g. the input file).
+    """
+    enable_lazy_imports()
+    sys.argv = [str(path), *args]
+    runpy.run_path(str(path), run_name="__main__")
+
+
+@dataclass
+class ImportReport:
+    # The sum of the cumulative times of the top-level modules imported by the solution
+    total_us: int = 0
+    # (module, cumulative time) of the top-level imports, the slowest first
+    modules: list[tuple[str, int]] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> ImportReport:
+    """
+    Parses the `-X importtime` output following the solution marker.
+    The lines look like "import time:   self [us] | cumulative | imported package",
+    with nested imports indented below the module that imported them.
+    """
+    report = ImportReport()
+    _, _, solution_part = stderr.partition("--- solution ---")
+
+    for line in solution_part.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, package = line.removeprefix("import time:").split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            # The header line
+            continue
+        # Only the top-level ones, their cumulative time includes the nested imports
+        if package.startswith(" ") and not package.startswith("  "):
+            report.modules.append((package.strip(), cumulative))
+
+    report.modules.sort(key=lambda module: module[1], reverse=True)
+    report.total_us = sum(cumulative for _, cumulative in report.modules)
+    return report
+
+
+def measure_imports(day: Day) -> ImportReport:
+    """
+    Imports the solution in a fresh interpreter with `-X importtime`.
+
+    Parameters:
+        day (Day): The measured day.
+
+    Returns:
+        ImportReport: The import cost of the modules the solution pulls in.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, str(day.path)],
+        cwd=day.directory,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return parse_importtime(process.stderr)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.imports", description="Measure and reduce the import cost.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lazy_parser = subparsers.add_parser("lazy", help="run a solution with the heavy modules imported lazily")
+    lazy_parser.add_argument("path", type=Path, help="the solution file")
+    lazy_parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments of the solution")
+
+    report_parser = subparsers.add_parser("report", help="report the import time of every day")
+    report_parser.add_argument("targets", type=target_argument, nargs="*", help='days to measure, e.g. "2015" or "2015/4" (default: all)')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+
+    if args.command == "lazy":
+        run_lazy(args.path.resolve(), args.args)
+        return
+
+    for day in discover(targets=args.targets):
+        if not day.is_template:
+            # Legacy days run their code on import
+            continue
+        try:
+            report = measure_imports(day)
+        except RuntimeError as e:
+            print(f"{day.key:<8}  error: {e}")
+            continue
+        heaviest = ", ".join(f"{name} {us / 1000:.1f}" for name, us in report.modules[:3])
+        print(f"{day.key:<8}  {report.total_us / 1000:>8.1f} ms  {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
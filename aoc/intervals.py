@@ -0,0 +1,240 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Integer interval sets.
+#
+# The range puzzles scan point by point or range by range: 2025/5 part1 tests every
+# range for every ingredient, 2022/4 builds `set(range(...))`, 2022/15 walks every x
+# of a row and 2023/5 `split_ranges` pops from the front of a list. Here:
+#   - `IntervalSet` keeps disjoint, sorted and merged half-open intervals [start, stop),
+#     with bisect membership, union / intersection / difference in linear time after
+#     an O(n log n) normalization, and the total length
+#   - `IntervalMap` is a piecewise offset mapping (the 2023/5 almanac maps), applied
+#     to single values or to whole interval sets
+#
+# The puzzles mostly use inclusive ranges, hence `IntervalSet.from_inclusive`.
+#
+# Usage:
+#   from aoc.intervals import IntervalSet
+#
+#   fresh = IntervalSet.from_inclusive(fresh_ranges)
+#   part1 = sum(ingredient_id in fresh for ingredient_id in ingredient_ids)
+#   part2 = fresh.length
+# --------------------------------------------------------------------------------------
+
+from bisect import bisect_right
+from typing import Iterable, Iterator
+
+
+class IntervalSet:
+    """
+    Immutable set of integers stored as disjoint, non-adjacent half-open intervals.
+    """
+
+    __slots__ = ("_starts", "_stops")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        """
+        Parameters:
+            intervals (Iterable[tuple[int, int]]): Half-open (start, stop) pairs in any
+                order, possibly overlapping; the empty ones are ignored.
+        """
+        self._starts: list[int] = []
+        self._stops: list[int] = []
+        for start, stop in sorted(interval for interval in intervals if interval[0] < interval[1]):
+            if self._stops and start <= self._stops[-1]:
+                # Overlapping or adjacent to the previous one
+                if stop > self._stops[-1]:
+                    self._stops[-1] = stop
+            else:
+                self._starts.append(start)
+                self._stops.append(stop)
+
+    @classmethod
+    def from_inclusive(cls, intervals: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """
+        Creates the set from inclusive (first, last) pairs, e.g. "3-5" of 2025/5.
+        """
+        return cls((first, last + 1) for first, last in intervals)
+
+    @classmethod
+    def _from_normalized(cls, starts: list[int], stops: list[int]) -> "IntervalSet":
+        interval_set = cls.__new__(cls)
+        interval_set._starts = starts
+        interval_set._stops = stops
+        return interval_set
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self._starts, self._stops)
+
+    def __len__(self) -> int:
+        """
+        The number of disjoint intervals; see `length` for the number of integers.
+        """
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._stops == other._stops
+
+    def __hash__(self) -> int:
+        return hash((tuple(self._starts), tuple(self._stops)))
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self._starts, value) - 1
+        return i >= 0 and value < self._stops[i]
+
+    @property
+    def length(self) -> int:
+        """
+        The number of integers in the set.
+        """
+        return sum(self._stops) - sum(self._starts)
+
+    @property
+    def bounds(self) -> tuple[int, int] | None:
+        """
+        The half-open (start, stop) hull of the set, None if it is empty.
+        """
+        if not self._starts:
+            return None
+        return self._starts[0], self._stops[-1]
+
+    def inclusive(self) -> list[tuple[int, int]]:
+        return [(start, stop - 1) for start, stop in self]
+
+    def covers(self, start: int, stop: int) -> bool:
+        """
+        Whether the whole half-open interval [start, stop) is in the set.
+        """
+        if start >= stop:
+            return True
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and stop <= self._stops[i]
+
+    def overlaps(self, start: int, stop: int) -> bool:
+        """
+        Whether any integer of the half-open interval [start, stop) is in the set.
+        """
+        if start >= stop:
+            return False
+        i = bisect_right(self._starts, stop - 1) - 1
+        return i >= 0 and self._stops[i] > start
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet([*self, *other])
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        starts, stops = [], []
+        i = j = 0
+        while i < len(self._starts) and j < len(other._starts):
+            start = max(self._starts[i], other._starts[j])
+            stop = min(self._stops[i], other._stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            # Advance the interval ending first, it cannot overlap anything further
+            if self._stops[i] < other._stops[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_normalized(starts, stops)
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        starts, stops = [], []
+        j = 0
+        for start, stop in self:
+            # Skip the removed intervals ending before this one
+            while j < len(other._starts) and other._stops[j] <= start:
+                j += 1
+            k = j
+            while k < len(other._starts) and other._starts[k] < stop:
+                if other._starts[k] > start:
+                    starts.append(start)
+                    stops.append(other._starts[k])
+                start = max(start, other._stops[k])
+                k += 1
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return IntervalSet._from_normalized(starts, stops)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
+class IntervalMap:
+    """
+    Piecewise offset mapping: values in [start, stop) of a piece are moved by its offset,
+    all other values are mapped to themselves (the 2023/5 almanac semantics).
+    The pieces must not overlap.
+    """
+
+    __slots__ = ("_starts", "_stops", "_offsets")
+
+    def __init__(self, pieces: Iterable[tuple[int, int, int]] = ()) -> None:
+        """
+        Parameters:
+            pieces (Iterable[tuple[int, int, int]]): Half-open (start, stop, offset) triples.
+        """
+        ordered = sorted(piece for piece in pieces if piece[0] < piece[1])
+        for (_, stop, _), (start, _, _) in zip(ordered, ordered[1:]):
+            if start < stop:
+                raise ValueError("The pieces of an IntervalMap must not overlap")
+        self._starts = [start for start, _, _ in ordered]
+        self._stops = [stop for _, stop, _ in ordered]
+        self._offsets = [offset for _, _, offset in ordered]
+
+    @classmethod
+    def from_almanac(cls, lines: Iterable[tuple[int, int, int]]) -> "IntervalMap":
+        """
+        Creates the mapping from (destination start, source start, length) triples of 2023/5.
+        """
+        return cls(
+            (source, source + length, destination - source)
+            for destination, source, length in lines
+        )
+
+    def __repr__(self) -> str:
+        return f"IntervalMap({list(zip(self._starts, self._stops, self._offsets))})"
+
+    def __call__(self, value: int) -> int:
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and value < self._stops[i]:
+            return value + self._offsets[i]
+        return value
+
+    def apply(self, values: IntervalSet) -> IntervalSet:
+        """
+        Maps every integer of the set, splitting its intervals at the piece boundaries.
+        """
+        mapped = []
+        for start, stop in values:
+            i = max(bisect_right(self._starts, start) - 1, 0)
+            while start < stop:
+                if i >= len(self._starts) or stop <= self._starts[i]:
+                    # No more pieces inside, the rest maps to itself
+                    mapped.append((start, stop))
+                    break
+                if start < self._starts[i]:
+                    # The gap before the next piece
+                    mapped.append((start, self._starts[i]))
+                    start = self._starts[i]
+                if start < self._stops[i]:
+                    end = min(stop, self._stops[i])
+                    mapped.append((start + self._offsets[i], end + self._offsets[i]))
+                    start = end
+                i += 1
+        return IntervalSet(mapped)
@@ -0,0 +1,202 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Running single stages in a forked child process under budgets.
+#
+# The SIGALRM based `--timeout` of the runner cannot stop a solution stuck inside a
+# single C call, and a part allocating without bounds (2015/19 part2 molecules,
+# 2022/17 part2 on scaled inputs) takes the whole run down with it. An isolated stage:
+#   - runs in a child forked from the runner, so it sees the already parsed input
+#     without serializing it, and its result is sent back pickled through a pipe
+#   - is killed with SIGKILL once its wall-clock budget is exhausted, together with
+#     every process it started (it leads its own process group, e.g. a pool of workers);
+#     a stage making several calls (the repeated runs of the benchmark) calls
+#     `restart_budget()` before each one, so that the budget applies per call
+#   - has its address space limited (RLIMIT_AS) to the size at the fork plus the
+#     memory budget, so a runaway allocation raises MemoryError inside the child
+#
+# Usage: python -m aoc.bench --part-timeout 30 --part-memory 1G
+# --------------------------------------------------------------------------------------
+
+import os
+import pickle
+import resource
+import select
+import signal
+import sys
+from time import monotonic
+from typing import Callable
+
+
+# Messages of the child: a budget restart, or the length prefixed result. Processes
+# forked by the stage may keep the pipe open after the child exits, so the end of the
+# result is known from its length rather than from the end of the pipe.
+RESTART = b"r"
+RESULT = b"="
+
+# The pipe to the runner, set inside of the isolated child only
+parent_fd: int | None = None
+
+
+class StageTimeout(Exception):
+    """
+    The isolated stage exceeded its wall-clock budget and was killed.
+    """
+
+
+class StageCrashed(Exception):
+    """
+    The isolated stage failed, or its process died without reporting a result.
+    """
+
+
+def address_space() -> int | None:
+    """
+    Returns the current virtual memory size of the process, None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def limit_memory(budget: int) -> None:
+    # The forked child already maps everything the runner mapped (NumPy, the input),
+    # so the limit is relative to the current size
+    limit = (address_space() or 0) + budget
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def restart_budget() -> None:
+    """
+    Gives the isolated stage its whole wall-clock budget again, a no-op outside of one.
+    """
+    if parent_fd is not None:
+        os.write(parent_fd, RESTART)
+
+
+def run_child(func: Callable[[], object], write_fd: int, memory_budget: int | None) -> None:
+    # Never returns, os._exit skips the cleanup (and the stdout buffers) of the runner
+    global parent_fd
+    try:
+        parent_fd = write_fd
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+        if memory_budget is not None:
+            limit_memory(memory_budget)
+        try:
+            payload = pickle.dumps((True, func()))
+        except BaseException as e:
+            payload = pickle.dumps((False, f"{type(e).__name__}: {e}"))
+        with os.fdopen(write_fd, "wb") as f:
+            f.write(RESULT + len(payload).to_bytes(8, "little") + payload)
+    finally:
+        os._exit(0)
+
+
+def read_result(read_fd: int, timeout: float | None) -> bytes:
+    """
+    Reads the messages of the child until its result, empty if the child closed the pipe
+    without one. The child may be blocked writing a large result, so the pipe is drained
+    while waiting rather than after the child exits.
+    """
+    deadline = None if timeout is None else monotonic() + timeout
+    data = bytearray()
+    while True:
+        # Budget restarts, until the start of the result
+        while data[:1] == RESTART:
+            del data[:1]
+            if timeout is not None:
+                deadline = monotonic() + timeout
+        if data[:1] == RESULT and len(data) >= 9:
+            size = int.from_bytes(data[1:9], "little")
+            if len(data) >= 9 + size:
+                return bytes(data[9:9 + size])
+
+        remaining = None if deadline is None else deadline - monotonic()
+        if remaining is not None and remaining <= 0:
+            raise StageTimeout()
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            raise StageTimeout()
+        chunk = os.read(read_fd, 1 << 16)
+        if not chunk:
+            return b""
+        data += chunk
+
+
+def kill_group(pid: int) -> None:
+    # The group of the child has its pid, killing it also stops the processes it started
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # No such group, only possible before the child ran setpgid
+        os.kill(pid, signal.SIGKILL)
+
+
+def run_isolated(func: Callable[[], object], timeout: float | None = None, memory_budget: int | None = None) -> object:
+    """
+    Calls `func` in a forked child process and returns its result.
+
+    Parameters:
+        func (callable): The stage, called without arguments. Its result must be picklable.
+        timeout (float | None): The wall-clock budget in seconds, counted from the start
+            or from the last `restart_budget()` call of `func`.
+        memory_budget (int | None): The bytes the child may allocate on top of the runner.
+
+    Returns:
+        object: The result of `func`.
+
+    Raises:
+        StageTimeout: The budget was exceeded, the child is killed.
+        StageCrashed: `func` raised, or the child died (e.g. killed by the OS).
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        run_child(func, write_fd, memory_budget)
+
+    os.close(write_fd)
+    try:
+        # Also set from this side, so the group exists before the child gets to run
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    finished = False
+    try:
+        payload = read_result(read_fd, timeout)
+        _, status = os.waitpid(pid, 0)
+        finished = True
+    finally:
+        os.close(read_fd)
+        # Also on StageTimeout or a DayTimeout of the runner, which interrupts the wait
+        if not finished:
+            kill_group(pid)
+            os.waitpid(pid, 0)
+        else:
+            # Processes the stage started and left behind
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    if not payload:
+        if os.WIFSIGNALED(status):
+            raise StageCrashed(f"killed by {signal.Signals(os.WTERMSIG(status)).name}")
+        raise StageCrashed(f"exited with status {os.waitstatus_to_exitcode(status)}")
+
+    ok, value = pickle.loads(payload)
+    if not ok:
+        raise StageCrashed(value)
+    return value
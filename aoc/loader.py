@@ -0,0 +1,215 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Bytes-based input loading.
+#
+# The templates parse with `f.read().split("\n")` followed by `line.split()` filters,
+# creating several intermediate lists of strings before the first `int()` call. For
+# multi-megabyte (generated) inputs this dominates the parse time and memory.
+#
+# The loader works on bytes directly:
+#   - `iter_lines` yields zero-copy memoryviews of the lines of the copy-on-write
+#     mapping, `lines` / `records` return the lines / blank-line separated blocks as bytes
+#   - `char_grid` exposes a character map as a 2D `np.uint8` array backed by the mapping
+#   - `ints`, `ints_per_line`, `comma_separated_ints` read the file once as bytes and
+#     parse integers without decoding to str (`int()` accepts bytes); `bytes.split` on
+#     one read beats tokenizing the mapping (and NumPy cannot parse an mmap), so these
+#     do not map the file
+#   - `int_array`, `int_matrix` parse integers in bulk into NumPy arrays
+#
+# Usage:
+#   from aoc.loader import ints_per_line
+#
+#   def get_input(filename: str):
+#       return ints_per_line(filename)
+# --------------------------------------------------------------------------------------
+
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Iterator
+
+
+NON_BLANK_PATTERN = re.compile(rb"\S")
+BLANK_LINE_PATTERN = re.compile(rb"\n[ \t\r]*\n")
+
+NEWLINE = ord("\n")
+
+
+def map_file(filename: str) -> mmap.mmap | bytes:
+    """
+    Maps the file into memory copy-on-write, so views of it can be modified without
+    touching the file. Empty files cannot be mapped and are returned as empty bytes.
+
+    Parameters:
+        filename (str): The input file.
+
+    Returns:
+        mmap.mmap | bytes: The mapped content.
+    """
+    with open(filename, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except ValueError:
+            return b""
+
+
+@contextmanager
+def mapped(filename: str):
+    data = map_file(filename)
+    try:
+        yield data
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def iter_lines(data: mmap.mmap | bytes) -> Iterator[memoryview]:
+    """
+    Yields every non-blank line of the data as a memoryview, without copying.
+    The views must not outlive the mapping.
+    """
+    view = memoryview(data)
+    start = 0
+    end = len(data)
+    while start < end:
+        newline = data.find(b"\n", start)
+        if newline == -1:
+            newline = end
+        line = view[start:newline]
+        if NON_BLANK_PATTERN.search(line):
+            yield line
+        start = newline + 1
+
+
+def lines(filename: str) -> list[bytes]:
+    """
+    Reads the non-blank lines of the file as bytes.
+    """
+    with mapped(filename) as data:
+        return [bytes(line).rstrip(b"\r") for line in iter_lines(data)]
+
+
+def records(filename: str) -> list[bytes]:
+    """
+    Reads the blank-line separated blocks of the file (e.g. 2023/5 maps, 2025/5 ranges and ids).
+    """
+    with mapped(filename) as data:
+        return [
+            block.strip()
+            for block in BLANK_LINE_PATTERN.split(data)
+            if block.strip()
+        ]
+
+
+def read_bytes(filename: str) -> bytes:
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def ints(filename: str) -> list[int]:
+    """
+    Parses all whitespace separated integers of the file into a flat list
+    (e.g. 2015/17 one container per line).
+    """
+    return list(map(int, read_bytes(filename).split()))
+
+
+def ints_per_line(filename: str) -> list[list[int]]:
+    """
+    Parses the whitespace separated integers of every non-blank line
+    (e.g. 2016/3 triangles, 2023/9 histories).
+    """
+    return [
+        list(map(int, line.split()))
+        for line in read_bytes(filename).split(b"\n")
+        if line.strip()
+    ]
+
+
+def comma_separated_ints(filename: str) -> list[int]:
+    """
+    Parses a single line of comma separated integers (e.g. 2021/6 and 2021/7).
+    """
+    # int() ignores the surrounding whitespace, including the trailing newline
+    return list(map(int, read_bytes(filename).split(b",")))
+
+
+def int_array(filename: str, sep: str = " "):
+    """
+    Parses all integers of the file into a flat `np.int64` array in C, several times
+    faster than calling int() for each of them. With the default separator any
+    whitespace (including newlines) separates the numbers.
+
+    Parameters:
+        filename (str): The input file.
+        sep (str): The separator, e.g. "," for comma separated inputs.
+
+    Returns:
+        np.ndarray: The parsed integers.
+    """
+    import numpy as np
+
+    # The text mode of fromstring (with sep) is the fast C parser, not the deprecated
+    # binary one; it needs bytes, not a mapping
+    return np.fromstring(read_bytes(filename), dtype=np.int64, sep=sep)
+
+
+def int_matrix(filename: str):
+    """
+    Parses a file of rows with the same number of whitespace separated integers
+    into a 2D `np.int64` array, e.g. the 2023/9 histories.
+
+    Parameters:
+        filename (str): The input file.
+
+    Returns:
+        np.ndarray: The parsed integers of shape (rows, columns).
+    """
+    import numpy as np
+
+    data = read_bytes(filename)
+    first_line = next(iter_lines(data), None)
+    columns = len(bytes(first_line).split()) if first_line is not None else 0
+    if not columns:
+        return np.zeros((0, 0), dtype=np.int64)
+    return np.fromstring(data, dtype=np.int64, sep=" ").reshape(-1, columns)
+
+
+def char_grid(filename: str):
+    """
+    Loads a rectangular character map as a 2D `np.uint8` array of the character codes,
+    e.g. `grid == ord("#")`. The array is a strided view of the copy-on-write mapping
+    (the newline column is skipped by the strides), so nothing is copied until the
+    grid is modified, and modifying it never touches the file.
+
+    Parameters:
+        filename (str): The input file, all lines of the same width.
+
+    Returns:
+        np.ndarray: The grid of shape (height, width).
+    """
+    import numpy as np
+
+    data = map_file(filename)
+    if not len(data):
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    width = data.find(b"\n")
+    if width == -1:
+        width = len(data)
+
+    # Ignore the trailing newlines
+    content_end = len(data)
+    while content_end and data[content_end - 1] == NEWLINE:
+        content_end -= 1
+
+    height = (content_end + 1) // (width + 1)
+    if height * (width + 1) - 1 != content_end:
+        raise ValueError(f"{filename} is not a rectangular grid")
+
+    return np.ndarray((height, width), dtype=np.uint8, buffer=data, strides=(width + 1, 1))
@@ -0,0 +1,145 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Memory instrumentation of single stages.
+#
+# Every instrumented stage gets two extra, unmeasured runs:
+#   - one under tracemalloc, reporting the peak of the Python allocations and the
+#     source lines holding the most memory when the stage returns
+#   - one with a background thread sampling the resident set size of the process,
+#     reporting its maximum during the stage
+#
+# They are separate runs, because the tracemalloc bookkeeping inflates the RSS.
+#
+# Usage: python -m aoc.bench 2022/17 --memory [--memory-budget 512M]
+# --------------------------------------------------------------------------------------
+
+import io
+import os
+import re
+import resource
+import threading
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+RSS_SAMPLE_INTERVAL = 0.005
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMG]?)i?B?$", re.IGNORECASE)
+
+
+@dataclass
+class MemoryUsage:
+    peak_bytes: int
+    rss_bytes: int
+    top_sites: list[str] = field(default_factory=list)
+
+
+def parse_size(size: str) -> int:
+    """
+    Parses a human readable size such as "512M", "2G" or "1048576".
+
+    Parameters:
+        size (str): The size to parse.
+
+    Returns:
+        int: The size in bytes.
+    """
+    match = SIZE_PATTERN.match(size.strip())
+    if match is None:
+        raise ValueError(f"Invalid size: {size}")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+def format_size(size: int | None) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 1024 ** 2:.1f}"
+
+
+def current_rss() -> int:
+    """
+    Returns the current resident set size. Falls back to the lifetime maximum
+    where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@contextmanager
+def sample_rss(interval: float = RSS_SAMPLE_INTERVAL):
+    """
+    Tracks the maximal RSS of the process in a background thread.
+
+    Yields:
+        list[int]: A single-element list holding the maximum, updated until the block exits.
+    """
+    maximum = [current_rss()]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(interval):
+            maximum[0] = max(maximum[0], current_rss())
+
+    thread = threading.Thread(target=sample, daemon=True)
+    thread.start()
+    try:
+        yield maximum
+    finally:
+        stop.set()
+        thread.join()
+        maximum[0] = max(maximum[0], current_rss())
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, limit: int) -> list[str]:
+    return [
+        f"{stat.traceback[0].filename.rsplit(os.sep, 1)[-1]}:{stat.traceback[0].lineno}"
+        f" {stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def measure_memory(func: Callable, make_args: Callable[[], tuple], top: int = 5) -> MemoryUsage:
+    """
+    Measures the memory usage of a single stage.
+
+    Parameters:
+        func (callable): The instrumented stage.
+        make_args (callable): Factory returning a fresh tuple of arguments for each call.
+        top (int): The number of reported allocation sites.
+
+    Returns:
+        MemoryUsage: The tracemalloc peak, the maximal RSS and the top allocation sites.
+    """
+    args = make_args()
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        # Taken while the result is still alive, so its allocations are included
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+    finally:
+        tracemalloc.stop()
+    del result
+
+    args = make_args()
+    with redirect_stdout(io.StringIO()), sample_rss() as rss:
+        func(*args)
+
+    return MemoryUsage(peak, rss[0], top_sites(snapshot, top))
@@ -0,0 +1,78 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Parallel execution of whole days.
+#
+# Every day is an isolated job in a `ProcessPoolExecutor`, so module-level state of
+# one solution never leaks into another. Jobs are submitted longest-expected-first
+# based on the benchmark history, which lets the few slow days (2015/4, 2022/11,
+# 2022/12, ...) start immediately while the short ones fill the remaining workers.
+# Days missing from the history are treated as the slowest ones.
+#
+# Usage: python -m aoc.bench -j 0 --timeout 60
+# --------------------------------------------------------------------------------------
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc import history
+from aoc.bench import Options, Timing, ERROR, run_day
+from aoc.discovery import Day
+
+
+def schedule(days: list[Day], durations: dict[tuple[int, int], float]) -> list[Day]:
+    """
+    Orders the days by their expected duration, the longest (or unknown) first.
+
+    Parameters:
+        days (list[Day]): The days to run.
+        durations (dict): (year, day) mapped to the expected duration, see `history.expected_durations`.
+
+    Returns:
+        list[Day]: The days in submission order.
+    """
+    return sorted(
+        days,
+        key=lambda day: durations.get((day.year, day.day), float("inf")),
+        reverse=True,
+    )
+
+
+def run_parallel(days: list[Day], options: Options = Options(), jobs: int | None = None) -> list[Timing]:
+    """
+    Benchmarks the days in a process pool.
+
+    Parameters:
+        days (list[Day]): The days to run.
+        options (Options): The benchmark settings; the timeout is enforced inside the worker.
+        jobs (int | None): The number of worker processes (None = one per CPU).
+
+    Returns:
+        list[Timing]: The timings of all days, ordered by year and day.
+    """
+    ordered = schedule(days, history.expected_durations(history.load()))
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(run_day, day, options): day
+            for day in ordered
+        }
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                results[day] = future.result()
+            except Exception as e:
+                # The worker itself died, e.g. killed by the OS
+                results[day] = [Timing(day.year, day.day, "main", status=ERROR, error=f"{type(e).__name__}: {e}")]
+            print(f"Finished {day.key}", file=sys.stderr)
+
+    return [
+        timing
+        for day in sorted(results, key=lambda d: (d.year, d.day))
+        for timing in results[day]
+    ]
@@ -0,0 +1,144 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# CPU profiling of single stages.
+#
+# Every profiled stage gets two extra, unmeasured runs:
+#   - one under cProfile, dumped to `<part>.prof` (for pstats / snakeviz)
+#   - one under a SIGPROF stack sampler, dumped to `<part>.folded` in the collapsed
+#     stack format ("frame;frame;frame count") understood by flamegraph.pl and speedscope
+#
+# The files are written to `.profile/<year>/<day>/`.
+#
+# Usage: python -m aoc.bench 2025/4 --profile [--profile-top 15]
+# --------------------------------------------------------------------------------------
+
+import cProfile
+import io
+import pstats
+import signal
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Callable
+
+from aoc.discovery import REPO_ROOT
+
+
+PROFILE_DIR = REPO_ROOT / ".profile"
+
+# 1 ms of consumed CPU time between the samples
+SAMPLE_INTERVAL = 0.001
+
+
+def frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse(frame: FrameType | None, root: CodeType | None = None) -> str | None:
+    """
+    Converts the stack ending in `frame` into a single "outer;...;inner" line.
+    With `root` given, the stack is cut at the frame executing that code, so the
+    benchmark harness does not show up in every stack.
+
+    Returns:
+        str | None: The collapsed stack, None if `root` is not on the stack.
+    """
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        if frame.f_code is root:
+            break
+        frame = frame.f_back
+    else:
+        if root is not None:
+            return None
+    return ";".join(reversed(names))
+
+
+@contextmanager
+def sample_stacks(root: CodeType | None = None, interval: float = SAMPLE_INTERVAL):
+    """
+    Samples the Python stack of the main thread every `interval` seconds of CPU time.
+
+    Parameters:
+        root (CodeType | None): The outermost recorded function, see `collapse`.
+        interval (float): CPU seconds between the samples.
+
+    Yields:
+        Counter: Collapsed stacks mapped to the number of samples, filled while running.
+    """
+    stacks = Counter()
+
+    def on_sample(signum, frame):
+        stack = collapse(frame, root)
+        if stack is not None:
+            stacks[stack] += 1
+
+    previous = signal.signal(signal.SIGPROF, on_sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        yield stacks
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+
+def write_folded(stacks: Counter, path: Path) -> None:
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def top_functions(prof_path: Path, limit: int) -> str:
+    """
+    Formats the `limit` functions with the highest cumulative time.
+
+    Parameters:
+        prof_path (Path): A file written by cProfile.
+        limit (int): The number of listed functions.
+
+    Returns:
+        str: The pstats report.
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(str(prof_path), stream=output)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
+
+
+def profile_stage(func: Callable, make_args: Callable[[], tuple], directory: Path, name: str) -> tuple[Path, Path]:
+    """
+    Profiles a single stage with cProfile and with the stack sampler.
+
+    Parameters:
+        func (callable): The profiled stage.
+        make_args (callable): Factory returning a fresh tuple of arguments for each call.
+        directory (Path): Where to write the profiles.
+        name (str): The stage name, used as the file name.
+
+    Returns:
+        tuple[Path, Path]: The paths of the `.prof` and `.folded` files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    prof_path = directory / f"{name}.prof"
+    folded_path = directory / f"{name}.folded"
+
+    args = make_args()
+    profiler = cProfile.Profile()
+    with redirect_stdout(io.StringIO()):
+        profiler.runcall(func, *args)
+    profiler.dump_stats(str(prof_path))
+
+    args = make_args()
+    with redirect_stdout(io.StringIO()), sample_stacks(getattr(func, "__code__", None)) as stacks:
+        func(*args)
+    write_folded(stacks, folded_path)
+
+    return prof_path, folded_path
@@ -0,0 +1,130 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Input size sweeps.
+#
+# Runs a day on generated inputs (see aoc.generators) of growing scale and fits the
+# empirical complexity exponent k of every part, assuming time ~ scale^k. The exponent
+# is the least-squares slope of log(median) over log(scale); k ~ 1 means linear,
+# k ~ 2 quadratic. Real puzzle inputs are too small to show the difference.
+#
+# Usage: python -m aoc.sweep 2023/11 [--scales 1 2 4 8] [--seed 0] [-n 3] [--timeout 60]
+# --------------------------------------------------------------------------------------
+
+import argparse
+import sys
+import tempfile
+from math import log
+from pathlib import Path
+
+from aoc import generators
+from aoc.bench import OK, Options, Timing, run_day
+from aoc.discovery import discover, target_argument
+
+
+def fit_exponent(scales: list[float], medians: list[float]) -> float | None:
+    """
+    Fits k in `median ~ c * scale^k` with least squares in log-log space.
+
+    Parameters:
+        scales (list[float]): The input scales.
+        medians (list[float]): The measured medians for the scales.
+
+    Returns:
+        float | None: The exponent, None with fewer than two distinct scales.
+    """
+    points = [
+        (log(scale), log(median))
+        for scale, median in zip(scales, medians)
+        if scale > 0 and median > 0
+    ]
+    if len({x for x, _ in points}) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
+def sweep(day, scales: list[float], seed: int, options: Options) -> dict[float, list[Timing]]:
+    """
+    Benchmarks the day on a generated input for every scale. Stops at the first scale
+    at which any part fails or times out, as the larger ones would too.
+
+    Returns:
+        dict[float, list[Timing]]: The timings of every completed scale.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="aoc-sweep-") as directory:
+        for scale in scales:
+            input_path = Path(directory) / f"input_{scale}.txt"
+            input_path.write_text(generators.generate(day.year, day.day, scale, seed))
+
+            print(f"Running {day.key} at scale {scale}...", file=sys.stderr)
+            # An absolute input name replaces the day directory in Day.input_path
+            timings = run_day(day, Options(**{**vars(options), "input_name": str(input_path)}))
+            results[scale] = timings
+
+            if any(timing.status != OK for timing in timings):
+                break
+    return results
+
+
+def format_sweep(results: dict[float, list[Timing]]) -> str:
+    scales = list(results)
+    parts = list(dict.fromkeys(timing.part for timings in results.values() for timing in timings))
+
+    header = ["part", *(f"x{scale:g} ms" for scale in scales), "exponent"]
+    rows = []
+    for part in parts:
+        medians = []
+        cells = []
+        for scale in scales:
+            timing = next((t for t in results[scale] if t.part == part), None)
+            if timing is None or timing.status != OK:
+                cells.append(timing.status if timing else "-")
+                continue
+            medians.append((scale, timing.median_ns))
+            cells.append(f"{timing.median_ns / 1e6:.3f}")
+
+        exponent = fit_exponent([s for s, _ in medians], [m for _, m in medians])
+        rows.append([part, *cells, "-" if exponent is None else f"{exponent:.2f}"])
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in [header, *rows]
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc.sweep", description="Fit the complexity of a day on generated inputs.")
+    parser.add_argument("targets", type=target_argument, nargs="+", help='days to sweep, e.g. "2023/11"')
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 2, 4, 8], help="input scales relative to the real input")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the generators")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="measured runs per part")
+    parser.add_argument("-w", "--warmup", type=int, default=0, help="unmeasured runs per part")
+    parser.add_argument("--timeout", type=float, help="wall-clock limit in seconds per scale")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    options = Options(repeat=args.repeat, warmup=args.warmup, timeout=args.timeout)
+
+    for day in discover(targets=args.targets):
+        if generators.get_generator(day.year, day.day) is None:
+            print(f"{day.key}: no input generator, skipping", file=sys.stderr)
+            continue
+        print(f"== {day.key} ==")
+        print(format_sweep(sweep(day, sorted(args.scales), args.seed, options)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# =============================================
+#  Maciej Garbacz | garbaczdev@gmail.com
+#  Advent of Code solutions
+#  https://github.com/garbaczdev/adventofcode
+# =============================================
+
+# --------------------------------------------------------------------------------------
+# Union-find (disjoint sets).
+#
+# 2025/8 checks whether two junction boxes are already connected with a full BFS
+# (`are_junction_boxes_connected`) before every merge, and part2 runs another one
+# (`get_circuit`) after each merge to see whether everything is connected, which makes
+# the Kruskal-style processing quadratic. With union by size and path compression
+# both checks are practically O(1), the size of every component is kept up to date and
+# the number of components is a counter.
+#
+# Elements are any hashable values, added on their first use; basins of 2021/9 or
+# cube groups of 2022/18 can use coordinates directly.
+#
+# Usage:
+#   from aoc.unionfind import UnionFind
+#
+#   circuits = UnionFind(range(len(junction_boxes)))
+#   for id_from, id_to, distance in possible_connections:
+#       if circuits.union(id_from, id_to) and circuits.count == 1:
+#           return junction_boxes[id_from].x * junction_boxes[id_to].x
+# --------------------------------------------------------------------------------------
+
+from typing import Hashable, Iterable
+
+
+class UnionFind:
+    """
+    Disjoint sets with union by size and path compression (halving).
+    """
+
+    __slots__ = ("parents", "sizes", "count")
+
+    def __init__(self, elements: Iterable[Hashable] = ()) -> None:
+        # The parent of every element; the roots are their own parents
+        self.parents: dict[Hashable, Hashable] = {}
+        # The component sizes, kept for the roots only
+        self.sizes: dict[Hashable, int] = {}
+        # The number of components
+        self.count = 0
+        for element in elements:
+            self.add(element)
+
+    def __len__(self) -> int:
+        """
+        The number of elements; see `count` for the number of components.
+        """
+        return len(self.parents)
+
+    def __contains__(self, element: Hashable) -> bool:
+        return element in self.parents
+
+    def add(self, element: Hashable) -> None:
+        if element not in self.parents:
+            self.parents[element] = element
+            self.sizes[element] = 1
+            self.count += 1
+
+    def find(self, element: Hashable) -> Hashable:
+        """
+        Returns the root representing the component of the element, adding it if needed.
+        """
+        parents = self.parents
+        if element not in parents:
+            self.add(element)
+            return element
+
+        while parents[element] != element:
+            # Path halving: every visited element skips its parent
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        """
+        Merges the components of the two elements.
+
+        Returns:
+            bool: False if they were already in the same component.
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+
+        # The smaller tree goes under the larger one, keeping the trees shallow
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes.pop(root_b)
+        self.count -= 1
+        return True
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        return self.find(a) == self.find(b)
+
+    def size(self, element: Hashable) -> int:
+        """
+        The size of the component of the element.
+        """
+        return self.sizes[self.find(element)]
+
+    def component_sizes(self) -> list[int]:
+        """
+        The sizes of all components, the largest first.
+        """
+        return sorted(self.sizes.values(), reverse=True)
+
+    def components(self) -> dict[Hashable, list[Hashable]]:
+        """
+        The elements of every component, keyed by its root.
+        """
+        groups = {}
+        for element in self.parents:
+            groups.setdefault(self.find(element), []).append(element)
+        return groups